@@ -0,0 +1,128 @@
+# analytics.py
+# precomputed aggregates for the analytics panel: count, mean rating and a rating
+# histogram per genre, decade and director, plus the top movies of every group.
+# import_csv.py rebuilds them after each import, so the panel only reads a few small rows
+import json
+import math
+
+DIMENSIONS = ("genre", "decade", "director")
+TOP_N = 10
+HISTOGRAM_BUCKETS = 10  # bucket i holds ratings in [i, i + 1), a perfect 10 goes in the last one
+GROUP_LIMIT = 200  # groups shown per dimension, largest first
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS analytics_summary (
+        dimension VARCHAR(16) NOT NULL,
+        group_name VARCHAR(255) NOT NULL,
+        movie_count INT NOT NULL,
+        mean_rating DECIMAL(4, 2),
+        histogram JSON NOT NULL,
+        PRIMARY KEY (dimension, group_name),
+        INDEX idx_dimension_count (dimension, movie_count)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analytics_top (
+        dimension VARCHAR(16) NOT NULL,
+        group_name VARCHAR(255) NOT NULL,
+        position TINYINT NOT NULL,
+        movie_id INT NOT NULL,
+        title VARCHAR(255),
+        release_year INT,
+        rating DECIMAL(3, 1),
+        PRIMARY KEY (dimension, group_name, position)
+    )
+    """,
+]
+
+# (dimension, FROM clause, group expression) over the movies table m
+GROUPINGS = [
+    ("genre", "movies m JOIN movie_genre mg ON mg.movie_id = m.id JOIN genres g ON g.id = mg.genre_id", "g.name"),
+    ("decade", "movies m", "CONCAT(FLOOR(m.release_year / 10) * 10, 's')"),
+    ("director", "movies m", "m.director"),
+]
+GROUP_FILTERS = {
+    "genre": "",
+    "decade": "WHERE m.release_year IS NOT NULL",
+    "director": "WHERE m.director <> ''",
+}
+
+HISTOGRAM_SQL = "JSON_ARRAY(" + ", ".join(
+    f"COALESCE(SUM(LEAST(FLOOR(m.rating), {HISTOGRAM_BUCKETS - 1}) = {bucket}), 0)" for bucket in range(HISTOGRAM_BUCKETS)
+) + ")"
+
+
+def create_tables(cursor):
+    for statement in SCHEMA:
+        cursor.execute(statement)
+
+
+def build(conn, cursor):
+    # one aggregate scan per dimension, replacing the previous rows in a single transaction
+    create_tables(cursor)
+    cursor.execute("DELETE FROM analytics_summary")
+    cursor.execute("DELETE FROM analytics_top")
+    for dimension, source, group in GROUPINGS:
+        where = GROUP_FILTERS[dimension]
+        cursor.execute(f"""
+            INSERT INTO analytics_summary (dimension, group_name, movie_count, mean_rating, histogram)
+            SELECT %s, {group}, COUNT(*), AVG(m.rating), {HISTOGRAM_SQL}
+            FROM {source} {where}
+            GROUP BY {group}
+        """, (dimension,))
+        cursor.execute(f"""
+            INSERT INTO analytics_top (dimension, group_name, position, movie_id, title, release_year, rating)
+            SELECT %s, group_name, position, id, title, release_year, rating FROM (
+                SELECT {group} AS group_name, m.id, m.title, m.release_year, m.rating,
+                       ROW_NUMBER() OVER (PARTITION BY {group} ORDER BY m.rating DESC, m.id DESC) AS position
+                FROM {source} {where}
+            ) ranked
+            WHERE position <= %s
+        """, (dimension, TOP_N))
+    conn.commit()
+    cursor.execute("SELECT COUNT(*) FROM analytics_summary")
+    return cursor.fetchone()[0]
+
+
+def group_names(movie, dimension):
+    # the python twin of GROUPINGS, used by the memory backend
+    if dimension == "genre":
+        return [name.strip() for name in (movie["genre"] or "").split(",") if name.strip()]
+    if dimension == "decade":
+        year = movie["release_year"]
+        return [] if year is None else [f"{year // 10 * 10}s"]
+    return [movie["director"]] if movie["director"] else []
+
+
+def summarize(movies, dimension):
+    # movies must already be sorted best first, the top lists are just the first TOP_N seen
+    groups = {}
+    for movie in movies:
+        for name in group_names(movie, dimension):
+            group = groups.setdefault(name, {"count": 0, "rated": 0, "total": 0.0,
+                                             "histogram": [0] * HISTOGRAM_BUCKETS, "top": []})
+            group["count"] += 1
+            if movie["rating"] is not None:
+                group["rated"] += 1
+                group["total"] += float(movie["rating"])
+                group["histogram"][min(math.floor(movie["rating"]), HISTOGRAM_BUCKETS - 1)] += 1
+            if len(group["top"]) < TOP_N:
+                group["top"].append({key: movie[key] for key in ("id", "title", "release_year", "rating")})
+    summary = [
+        {
+            "group_name": name,
+            "movie_count": group["count"],
+            "mean_rating": round(group["total"] / group["rated"], 2) if group["rated"] else None,
+            "histogram": group["histogram"],
+        }
+        for name, group in groups.items()
+    ]
+    summary.sort(key=lambda row: (-row["movie_count"], row["group_name"]))
+    tops = {name: group["top"] for name, group in groups.items()}
+    return summary[:GROUP_LIMIT], tops
+
+
+def parse_histogram(value):
+    # MySQL hands JSON columns back as text
+    return json.loads(value) if isinstance(value, (str, bytes)) else list(value)
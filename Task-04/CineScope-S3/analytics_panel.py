@@ -0,0 +1,165 @@
+# analytics_panel.py
+# the dashboard's 📊 Analytics window: per-genre, per-decade and per-director counts,
+# mean ratings, a rating histogram and the best movies of the selected group.
+# Everything is read from the precomputed rows (see analytics.py), never aggregated here
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QListWidget,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QWidget
+)
+from PySide6.QtGui import QColor, QFont, QPainter
+from PySide6.QtCore import Qt, QObject, QRunnable, QRect, Signal
+
+from analytics import DIMENSIONS, HISTOGRAM_BUCKETS
+
+
+class AnalyticsSignals(QObject):
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+
+
+class AnalyticsWorker(QRunnable):
+    # runs one backend call on the dashboard's query thread
+    def __init__(self, generation, call, *args):
+        super().__init__()
+        self.generation = generation
+        self.call = call
+        self.args = args
+        self.signals = AnalyticsSignals()
+
+    def run(self):
+        try:
+            result = self.call(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        self.signals.finished.emit(self.generation, result)
+
+
+class HistogramChart(QWidget):
+    # one bar per rating bucket, painted directly
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.bar = QColor("#e50914")
+        self.text = QColor(Qt.white)
+        self.setMinimumHeight(160)
+
+    def set_counts(self, counts):
+        self.counts = list(counts) or [0] * HISTOGRAM_BUCKETS
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(QFont("Open Sans", 8))
+        label_height = painter.fontMetrics().height()
+        area = self.rect().adjusted(4, label_height + 4, -4, -label_height - 4)
+        width = area.width() / len(self.counts)
+        peak = max(self.counts) or 1
+        for bucket, count in enumerate(self.counts):
+            height = round(area.height() * count / peak)
+            left = round(area.left() + bucket * width)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.bar)
+            painter.drawRect(left + 2, area.bottom() - height, max(1, round(width) - 4), height)
+            painter.setPen(self.text)
+            painter.drawText(QRect(left, area.bottom() + 2, round(width), label_height), Qt.AlignCenter, str(bucket))
+            if count:
+                painter.drawText(QRect(left, area.bottom() - height - label_height, round(width), label_height),
+                                 Qt.AlignCenter, str(count))
+        painter.end()
+
+
+class AnalyticsPanel(QDialog):
+    def __init__(self, backend, pool, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+        self.pool = pool  # shared with the searches, so the backend sees one caller at a time
+        self.generation = 0
+        self.rows = []
+        self.setWindowTitle("CineScope 📊 Analytics")
+        self.resize(900, 600)
+
+        layout = QVBoxLayout(self)
+        self.dimension = QComboBox()
+        self.dimension.addItems([dimension.capitalize() for dimension in DIMENSIONS])
+        self.dimension.currentIndexChanged.connect(self.load_groups)
+        layout.addWidget(self.dimension)
+
+        body = QHBoxLayout()
+        self.groups = QTableWidget(0, 3)
+        self.groups.setHorizontalHeaderLabels(["Group", "Movies", "Mean rating"])
+        self.groups.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.groups.verticalHeader().setVisible(False)
+        self.groups.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.groups.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.groups.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.groups.currentCellChanged.connect(self.select_group)
+        body.addWidget(self.groups, 3)
+
+        details = QVBoxLayout()
+        details.addWidget(QLabel("Rating histogram"))
+        self.histogram = HistogramChart()
+        details.addWidget(self.histogram)
+        details.addWidget(QLabel("Top rated"))
+        self.top = QListWidget()
+        details.addWidget(self.top)
+        body.addLayout(details, 2)
+        layout.addLayout(body)
+
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+    def current_dimension(self):
+        return DIMENSIONS[self.dimension.currentIndex()]
+
+    def run(self, call, on_finished, *args):
+        self.generation += 1
+        worker = AnalyticsWorker(self.generation, call, *args)
+        worker.signals.finished.connect(on_finished)
+        worker.signals.failed.connect(self.show_error)
+        self.pool.start(worker)
+
+    def load_groups(self):
+        self.status.setText("Loading…")
+        self.run(self.backend.analytics, self.show_groups, self.current_dimension())
+
+    def show_groups(self, generation, rows):
+        if generation != self.generation:
+            return
+        self.rows = rows
+        self.groups.setRowCount(len(rows))
+        for row, group in enumerate(rows):
+            mean = group["mean_rating"]
+            count = QTableWidgetItem()
+            count.setData(Qt.DisplayRole, group["movie_count"])
+            self.groups.setItem(row, 0, QTableWidgetItem(str(group["group_name"])))
+            self.groups.setItem(row, 1, count)
+            self.groups.setItem(row, 2, QTableWidgetItem("–" if mean is None else f"{float(mean):.2f}"))
+        self.status.setText(f"{len(rows)} groups" if rows else "No analytics yet, run import_csv.py first")
+        if rows:
+            # the current cell may already be (0, 0) from the previous dimension, so select explicitly
+            self.groups.blockSignals(True)
+            self.groups.setCurrentCell(0, 0)
+            self.groups.blockSignals(False)
+            self.select_group(0)
+        else:
+            self.histogram.set_counts([])
+            self.top.clear()
+
+    def select_group(self, row, *_):
+        if not 0 <= row < len(self.rows):
+            return
+        group = self.rows[row]
+        self.histogram.set_counts(group["histogram"])
+        self.run(self.backend.top_movies, self.show_top, self.current_dimension(), group["group_name"])
+
+    def show_top(self, generation, movies):
+        if generation != self.generation:
+            return
+        self.top.clear()
+        self.top.addItems([f"⭐ {movie['rating']}  {movie['title']} ({movie['release_year']})" for movie in movies])
+
+    def show_error(self, generation, message):
+        if generation == self.generation:
+            self.status.setText(f"Could not load analytics: {message}")
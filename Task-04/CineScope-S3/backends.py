@@ -0,0 +1,22 @@
+# backends.py
+# where the dashboard's searches are answered. Every backend has the same
+# search(filters, after=None, limit=PAGE_SIZE) -> list of movie dicts, plus
+# fuzzy_search(filters, limit=PAGE_SIZE) for typos, and analytics(dimension) and
+# top_movies(dimension, group_name) for the analytics panel.
+# Backends are imported lazily so the MySQL driver never slows down the first paint
+
+BACKENDS = ("mysql", "memory")
+
+
+def create_backend(name="mysql", csv_path="movies.csv"):
+    if name == "memory":
+        from memory_backend import MemoryBackend
+        return MemoryBackend(csv_path)
+    from mysql_backend import MySQLBackend
+    return MySQLBackend()
+
+
+def add_backend_arguments(parser):
+    parser.add_argument("--backend", choices=BACKENDS, default="mysql",
+                        help="mysql = search the database, memory = search movies.csv in memory (no server)")
+    parser.add_argument("--csv", default="movies.csv", help="catalogue for the memory backend, a CSV or a snapshot.py snapshot")
@@ -0,0 +1,354 @@
+# benchmark.py
+# synthetic large-catalogue benchmarks, printed (or written) as JSON so runs can be compared.
+#
+#   python benchmark.py --rows 10000 100000 1000000 --output bench.json
+#   python benchmark.py --rows 100000 --backends memory mysql --import-modes batch parallel
+#
+# Catalogues look like movies.csv but with skew: a few genres, directors, actors and title words
+# are very common and most are rare (Zipf-like), like real dumps. They are generated once per
+# (rows, seed) into --workdir and reused. MySQL runs go to a separate database (--database),
+# because the import benchmark empties the movies table. Rendering is measured on the
+# offscreen Qt platform, so no display is needed.
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import string
+import sys
+import time
+from itertools import accumulate
+
+GENRES = [
+    "Drama", "Comedy", "Action", "Thriller", "Romance", "Crime", "Adventure", "Horror", "Mystery",
+    "Biography", "Animation", "Family", "Fantasy", "Sci-Fi", "History", "War", "Music", "Sport",
+    "Western", "Musical", "Film-Noir",
+]
+TITLE_WORDS = 20000
+SEARCH_QUERIES = 200
+RENDER_PAGES = 20
+# above this many rows the memory backend is not built: it holds every movie in RAM
+MEMORY_MAX_ROWS = 1000000
+IMPORT_MODES = ("row", "batch", "sync", "parallel", "infile")
+
+
+def zipf_weights(count, exponent=1.1):
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def fake_word(rng):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def fake_name(rng):
+    return f"{fake_word(rng).capitalize()} {fake_word(rng).capitalize()}"
+
+
+class Catalogue:
+    # draws skewed movie rows; the same vocabularies are used to build realistic queries
+    def __init__(self, rows, seed):
+        self.rng = random.Random(seed)
+        rng = self.rng
+        self.words = [fake_word(rng) for _ in range(TITLE_WORDS)]
+        self.directors = [fake_name(rng) for _ in range(max(10, rows // 20))]
+        self.actors = [fake_name(rng) for _ in range(max(30, rows // 3))]
+        self.word_weights = zipf_weights(len(self.words))
+        self.genre_weights = zipf_weights(len(GENRES), 1.3)
+        self.director_weights = zipf_weights(len(self.directors))
+        self.actor_weights = zipf_weights(len(self.actors))
+
+    def rows(self, count, chunk=10000):
+        rng = self.rng
+        for start in range(0, count, chunk):
+            size = min(chunk, count - start)
+            words = iter(rng.choices(self.words, cum_weights=self.word_weights, k=size * 4))
+            actors = iter(rng.choices(self.actors, cum_weights=self.actor_weights, k=size * 3))
+            directors = rng.choices(self.directors, cum_weights=self.director_weights, k=size)
+            for i in range(size):
+                title = " ".join(next(words) for _ in range(rng.randint(1, 4))).title()
+                genres = sorted(set(rng.choices(GENRES, cum_weights=self.genre_weights, k=rng.randint(1, 3))))
+                # recent years are more common, ratings cluster around 6.5
+                year = max(1920, min(2025, int(2025 - abs(rng.gauss(0, 25)))))
+                rating = max(1.0, min(10.0, round(rng.gauss(6.5, 1.2), 1)))
+                yield [f"{title} {start + i}" if rng.random() < 0.3 else title, year, ", ".join(genres),
+                       "" if rng.random() < 0.01 else rating, directors[i], next(actors), next(actors), next(actors)]
+
+
+def generate(path, rows, seed):
+    # streamed to disk, memory use does not depend on rows
+    catalogue = Catalogue(rows, seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Series_Title", "Released_Year", "Genre", "IMDB_Rating", "Director", "Star1", "Star2", "Star3"])
+        writer.writerows(catalogue.rows(rows))
+    return catalogue
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def latency_summary(samples):
+    return {
+        "queries": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+    }
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+
+def bench_offline(csv_path, workdir, build_memory=True):
+    # the import paths that need no server: parsing, snapshot export and open, memory backend build.
+    # The backend comes back as None when build_memory is off
+    import import_csv
+    import snapshot
+    from memory_backend import MemoryBackend
+
+    parse_seconds, rows = timed(lambda: sum(1 for _ in import_csv.read_rows(csv_path)))
+    snapshot_path = os.path.join(workdir, os.path.basename(csv_path) + ".snap")
+    export_seconds, _ = timed(snapshot.export_csv, csv_path, snapshot_path)
+    open_seconds, _ = timed(snapshot.Snapshot, snapshot_path)
+    report = {
+        "parse_rows_per_s": round(rows / parse_seconds),
+        "snapshot_export_s": round(export_seconds, 3),
+        "snapshot_open_ms": round(open_seconds * 1000, 3),
+    }
+    if not build_memory:
+        return report, None
+    # one backend in memory at a time: the CSV build is dropped before the snapshot build
+    build_seconds, _ = timed(MemoryBackend, csv_path)
+    snapshot_build_seconds, backend = timed(MemoryBackend, snapshot_path)
+    report["memory_backend_build_s"] = round(build_seconds, 3)
+    report["memory_backend_build_from_snapshot_s"] = round(snapshot_build_seconds, 3)
+    return report, backend
+
+
+def bench_import(csv_path, modes, batch_size):
+    # each mode starts from an empty movies table in the benchmark database
+    import db_pool
+    import import_csv
+
+    results = {}
+    db_pool.ensure_database()
+    conn = db_pool.connection()
+    cursor = conn.cursor()
+    import_csv.create_schema(cursor)
+    import_csv.normalize.create_tables(cursor)
+    for mode in modes:
+        cursor.execute(f"TRUNCATE TABLE {import_csv.TABLE_NAME}")
+        cursor.execute(f"TRUNCATE TABLE {import_csv.STATE_TABLE}")
+        if mode == "infile" and not import_csv.local_infile_enabled(cursor):
+            results[mode] = {"skipped": "local_infile disabled on the server"}
+            continue
+        started = time.perf_counter()
+        if mode == "row":
+            count = import_csv.import_per_row(conn, cursor, csv_path)
+        elif mode == "batch":
+            count = import_csv.import_batched(conn, cursor, csv_path, batch_size)
+        elif mode == "sync":
+            count = import_csv.import_sync(conn, cursor, csv_path, batch_size)
+        elif mode == "parallel":
+            count = import_csv.import_parallel(csv_path, batch_size, os.cpu_count() or 1, 2)
+        else:
+            count = import_csv.import_infile(conn, cursor, csv_path)
+        seconds = time.perf_counter() - started
+        results[mode] = {"rows": count, "seconds": round(seconds, 3), "rows_per_s": round(count / seconds)}
+
+    # the derived tables the dashboard needs, built once from the last import
+    stages = (
+        ("normalize", lambda: import_csv.normalize.build(conn, cursor, batch_size)),
+        ("analytics", lambda: import_csv.analytics.build(conn, cursor)),
+        ("fuzzy", lambda: import_csv.fuzzy.build(conn, cursor, batch_size)),
+    )
+    for name, stage in stages:
+        results[f"{name}_stage_s"] = round(timed(stage)[0], 3)
+    import_csv.bump_catalogue_version(conn, cursor)
+    cursor.close()
+    conn.close()
+    return results
+
+
+def make_queries(catalogue, seed):
+    rng = random.Random(seed + 1)
+
+    def typo(text):
+        i = rng.randrange(len(text))
+        return text[:i] + rng.choice(string.ascii_lowercase) + text[i + 1:]
+
+    def pick_word():
+        return rng.choices(catalogue.words, cum_weights=catalogue.word_weights)[0]
+
+    def pick_actor():
+        return rng.choices(catalogue.actors, cum_weights=catalogue.actor_weights)[0].lower()
+
+    n = SEARCH_QUERIES
+    return {
+        "all": [("", "", "", "")] * n,
+        "title": [(pick_word(), "", "", "") for _ in range(n)],
+        "actor": [("", pick_actor(), "", "") for _ in range(n)],
+        "genre": [("", "", rng.choice(GENRES).lower()[:4], "") for _ in range(n)],
+        "year": [("", "", "", str(rng.randint(1950, 2025))) for _ in range(n)],
+        "combined": [(pick_word(), "", rng.choice(GENRES).lower(), "") for _ in range(n)],
+        "fuzzy_title": [(typo(pick_word() + " " + pick_word()), "", "", "") for _ in range(n)],
+        "fuzzy_actor": [("", typo(pick_actor()), "", "") for _ in range(n)],
+    }
+
+
+def bench_search(backend, queries, deep_pages):
+    results = {}
+    for name, filters_list in queries.items():
+        search = backend.fuzzy_search if name.startswith("fuzzy") else backend.search
+        samples = [timed(search, filters)[0] for filters in filters_list]
+        results[name] = latency_summary(samples)
+
+    # keyset pagination: time the page after deep_pages pages of the unfiltered list
+    filters, after, samples = ("", "", "", ""), None, []
+    for _ in range(deep_pages):
+        seconds, movies = timed(backend.search, filters, after)
+        samples.append(seconds)
+        if not movies:
+            break
+        after = (movies[-1]["rating"], movies[-1]["id"])
+    results["next_page"] = latency_summary(samples)
+    return results
+
+
+def bench_render(backend, app):
+    # model update plus a synchronous repaint of the visible cards, one page at a time
+    from dashboard import Dashboard
+
+    dashboard = Dashboard()
+    dashboard.resize(1000, 700)
+    dashboard.show()
+    app.processEvents()
+    model, viewport = dashboard.model, dashboard.view.viewport()
+    filters, after = ("", "", "", ""), None
+    replace, append = [], []
+    for page in range(RENDER_PAGES):
+        movies = backend.search(filters, after)
+        if not movies:
+            break
+        after = (movies[-1]["rating"], movies[-1]["id"])
+        started = time.perf_counter()
+        if page % 2:
+            model.append_movies(movies)
+        else:
+            model.update_movies(movies)  # a new search replacing what is shown
+        viewport.repaint()
+        (append if page % 2 else replace).append(time.perf_counter() - started)
+    dashboard.close()
+    return {"replace_page": latency_summary(replace), "append_page": latency_summary(append)}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CineScope synthetic catalogue benchmarks")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000], help="catalogue sizes to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", default="bench_data", help="where generated catalogues are kept")
+    parser.add_argument("--backends", nargs="+", choices=["memory", "mysql"], default=["memory"])
+    parser.add_argument("--import-modes", nargs="*", choices=IMPORT_MODES, default=[],
+                        help="MySQL import modes to time (needs a server); the mysql backend imports in batch mode if none are given")
+    parser.add_argument("--database", default="cinescope_bench", help="MySQL database used by the benchmark")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--deep-pages", type=int, default=50, help="pages walked for the next_page latency")
+    parser.add_argument("--memory-max-rows", type=int, default=MEMORY_MAX_ROWS,
+                        help="largest catalogue the memory backend is built, searched and rendered for")
+    parser.add_argument("--no-render", action="store_true", help="skip the offscreen rendering benchmark")
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    os.makedirs(args.workdir, exist_ok=True)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    import db_pool
+    db_pool.DB_NAME = args.database  # never the real catalogue
+    # importer, its parallel writers and the search backend share one pool
+    db_pool.configure(pool_size=4, allow_local_infile=True)
+    import_modes = args.import_modes or (["batch"] if "mysql" in args.backends else [])
+    mysql = None
+
+    app = None
+    if not args.no_render:
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    report = {
+        "meta": {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+        },
+        "runs": [],
+    }
+    for rows in args.rows:
+        run = {"rows": rows}
+        csv_path = os.path.join(args.workdir, f"movies_{rows}_{args.seed}.csv")
+        if os.path.exists(csv_path):
+            catalogue = Catalogue(rows, args.seed)  # same seed, same vocabularies
+        else:
+            seconds, catalogue = timed(generate, csv_path, rows, args.seed)
+            run["generate_s"] = round(seconds, 3)
+        print(f"[{rows} rows] {csv_path}", file=sys.stderr)
+
+        build_memory = rows <= args.memory_max_rows
+        run["offline"], memory = bench_offline(csv_path, args.workdir, build_memory)
+        if import_modes:
+            try:
+                run["import"] = bench_import(csv_path, import_modes, max(1, args.batch_size))
+            except Exception as e:  # no server, wrong credentials...
+                run["import"] = {"skipped": str(e)}
+
+        queries = make_queries(catalogue, args.seed)
+        run["search"] = {}
+        for name in args.backends:
+            backend = memory
+            if name == "memory" and memory is None:
+                run["search"][name] = {"skipped": f"more than {args.memory_max_rows} rows"}
+                continue
+            if name == "mysql":
+                try:
+                    if mysql is None:
+                        from mysql_backend import MySQLBackend
+                        from search_cache import SearchCache
+                        mysql = MySQLBackend()
+                        mysql.cache = SearchCache(max_bytes=0)  # measure the queries, not the cache
+                    mysql.warm_up()
+                except Exception as e:  # no server, wrong credentials...
+                    run["search"][name] = {"skipped": str(e)}
+                    continue
+                backend = mysql
+            run["search"][name] = bench_search(backend, queries, args.deep_pages)
+
+        if app is not None:
+            if memory is not None:
+                run["render"] = bench_render(memory, app)
+            elif "mysql" in run["search"] and "skipped" not in run["search"]["mysql"]:
+                run["render"] = bench_render(mysql, app)
+            else:
+                run["render"] = {"skipped": f"more than {args.memory_max_rows} rows and no MySQL backend"}
+        memory = None  # free it before the next catalogue is generated
+        report["runs"].append(run)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
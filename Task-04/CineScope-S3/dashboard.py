@@ -1,98 +1,358 @@
 # dashboard_with_advanced_search.py
+import argparse
+import os
 import sys
-import mysql.connector
+import time
 from PySide6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QLineEdit,
-    QScrollArea, QGridLayout, QLabel, QFrame,
-    QHBoxLayout, QDialog, QPushButton, QFormLayout
+    QApplication, QWidget, QVBoxLayout, QLineEdit, QLabel,
+    QDialog, QPushButton, QFormLayout, QListView, QStyledItemDelegate, QStyle
+)
+from PySide6.QtGui import QFont, QFontMetrics, QColor, QPalette, QPainter, QPen
+from PySide6.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, QTimer, Signal,
+    QAbstractListModel, QModelIndex, QRect, QSize
 )
-from PySide6.QtGui import QFont, QColor, QPalette
-from PySide6.QtCore import Qt
-
-
-class MovieCard(QFrame):
-    def __init__(self, movie, parent=None):
-        super().__init__(parent)
-        self.movie = movie
-        self.setFrameShape(QFrame.StyledPanel)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #2b2b2b;
-                border-radius: 12px;
-                padding: 12px;
-            }
-            QFrame:hover {
-                background-color: #383838;
-                border: 1px solid #e50914;
-            }
-        """)
 
-        layout = QVBoxLayout(self)
+from backends import add_backend_arguments, create_backend
+from posters import THUMB_HEIGHT, THUMB_WIDTH, PosterLoader, add_poster_arguments
+from query_builder import PAGE_SIZE
+from search_cache import normalize_filters
 
-        title = QLabel(movie["title"])
-        title.setFont(QFont("Montserrat", 14, QFont.Bold))
-        title.setWordWrap(True)
-        layout.addWidget(title)
+# CINESCOPE_DEBUG=1 prints allocation and timing stats for every refresh
+DEBUG = os.environ.get("CINESCOPE_DEBUG") == "1"
+# wait this long after the last keystroke before searching
+SEARCH_DEBOUNCE_MS = 250
+CARD_HEIGHT = 140
+# how close (in pixels) to the bottom the next page is requested
+PREFETCH_MARGIN = 3 * CARD_HEIGHT
 
-        info = QLabel(f"{movie['release_year']} • {movie['genre']}")
-        info.setFont(QFont("Open Sans", 10))
-        layout.addWidget(info)
 
-        rating = QLabel(f"⭐ {movie['rating']}")
-        rating.setFont(QFont("Open Sans", 11, QFont.Bold))
-        rating.setStyleSheet("color: #FFD700;")
-        layout.addWidget(rating)
+class SearchSignals(QObject):
+    finished = Signal(int, list, bool, bool)  # generation, movies, append, fuzzy
+    failed = Signal(int, str)
 
-        director = QLabel(f"🎥 {movie['director']}")
-        director.setFont(QFont("Open Sans", 9))
-        layout.addWidget(director)
 
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            dlg = MovieDetailsDialog(self.movie, self)
-            dlg.exec()
+class SearchWorker(QRunnable):
+    def __init__(self, backend, generation, filters, after=None, latest_generation=None):
+        super().__init__()
+        self.backend = backend
+        self.generation = generation
+        self.latest_generation = latest_generation  # callable, the dashboard's current generation
+        self.filters = filters
+        self.after = after
+        self.signals = SearchSignals()
+
+    def run(self):
+        # superseded while it waited in the queue, its result would be dropped anyway
+        if self.latest_generation is not None and self.latest_generation() != self.generation:
+            return
+        title, actor = self.filters[:2]
+        fuzzy = False
+        try:
+            movies = self.backend.search(self.filters, self.after)
+            if not movies and self.after is None and (title or actor):
+                # nothing matched as typed, show the closest spellings instead
+                movies = self.backend.fuzzy_search(self.filters)
+                fuzzy = True
+        except Exception as e:  # report any backend failure instead of losing the worker
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        self.signals.finished.emit(self.generation, movies, self.after is not None, fuzzy)
+
+
+class MovieListModel(QAbstractListModel):
+    # only holds the rows, widgets are never created per movie
+    MovieRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.movies = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.movies)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        movie = self.movies[index.row()]
+        if role == Qt.DisplayRole:
+            return movie["title"]
+        if role == self.MovieRole:
+            return movie
+        return None
+
+    def set_movies(self, movies):
+        self.beginResetModel()
+        self.movies = list(movies)  # pages may be shared with the search cache
+        self.endResetModel()
+
+    def update_movies(self, movies):
+        # diff against what is shown: rows that stay are kept, only the delta is removed or inserted
+        new_ids = [movie["id"] for movie in movies]
+        wanted = set(new_ids)
+
+        # drop rows that are gone, bottom-up in contiguous runs so indexes stay valid
+        row = len(self.movies) - 1
+        while row >= 0:
+            if self.movies[row]["id"] in wanted:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self.movies[row]["id"] not in wanted:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self.movies[row + 1:last + 1]
+            self.endRemoveRows()
+
+        # the kept rows must appear in the same order in the new list, otherwise start over
+        kept = [movie["id"] for movie in self.movies]
+        kept_set = set(kept)
+        if kept != [movie_id for movie_id in new_ids if movie_id in kept_set]:
+            self.set_movies(movies)
+            return
+
+        row = 0
+        while row < len(movies):
+            if row < len(self.movies) and self.movies[row]["id"] == new_ids[row]:
+                self.movies[row] = movies[row]  # same movie, possibly fresher data
+                row += 1
+                continue
+            end = row
+            while end < len(movies) and new_ids[end] not in kept_set:
+                end += 1
+            self.beginInsertRows(QModelIndex(), row, end - 1)
+            self.movies[row:row] = movies[row:end]
+            self.endInsertRows()
+            row = end
+        if self.movies:
+            self.dataChanged.emit(self.index(0), self.index(len(self.movies) - 1))
+
+    def append_movies(self, movies):
+        if not movies:
+            return
+        first = len(self.movies)
+        self.beginInsertRows(QModelIndex(), first, first + len(movies) - 1)
+        self.movies.extend(movies)
+        self.endInsertRows()
+
+
+class CardStyle:
+    # fonts, metrics and colors built once and shared by every card and the details dialog
+    def __init__(self):
+        self.title_font = QFont("Montserrat", 14, QFont.Bold)
+        self.info_font = QFont("Open Sans", 10)
+        self.rating_font = QFont("Open Sans", 11, QFont.Bold)
+        self.director_font = QFont("Open Sans", 9)
+        self.dialog_title_font = QFont("Montserrat", 16, QFont.Bold)
+        self.metrics = {
+            font.key(): QFontMetrics(font)
+            for font in (self.title_font, self.info_font, self.rating_font, self.director_font)
+        }
+        self.white = QColor(Qt.white)
+        self.gold = QColor("#FFD700")
+        self.card = QColor("#2b2b2b")
+        self.placeholder = QColor("#1f1f1f")
+        self.placeholder_font = QFont("Open Sans", 20)
+        self.card_hover = QColor("#383838")
+        self.hover_pen = QPen(QColor("#e50914"), 1)
+
+    def metrics_for(self, font):
+        return self.metrics[font.key()]
+
+
+_card_style = None
+
+
+def card_style():
+    # QFont needs a running QApplication, so the shared style is created on first use
+    global _card_style
+    if _card_style is None:
+        _card_style = CardStyle()
+    return _card_style
+
+
+class MovieCardDelegate(QStyledItemDelegate):
+    # paints a card for each visible row, same look as the old QFrame/QLabel cards,
+    # with the poster on the left when a PosterLoader is given
+    MARGIN = 6
+    PADDING = 14
+
+    def __init__(self, parent=None, posters=None):
+        super().__init__(parent)
+        self.style = card_style()
+        self.posters = posters
+        self.paints = 0
+        self.paint_seconds = 0.0
+
+    def sizeHint(self, option, index):
+        return QSize(300, CARD_HEIGHT)
+
+    def paint(self, painter, option, index):
+        started = time.perf_counter() if DEBUG else 0
+        style = self.style
+        movie = index.data(MovieListModel.MovieRole)
+        card = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(style.hover_pen if hovered else Qt.NoPen)
+        painter.setBrush(style.card_hover if hovered else style.card)
+        painter.drawRoundedRect(card, 12, 12)
+
+        text = card.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        if self.posters is not None:
+            self.paint_poster(painter, movie["id"], card)
+            text.setLeft(card.left() + self.PADDING // 2 + THUMB_WIDTH + self.PADDING)
+        y = text.top()
+        lines = (
+            (style.title_font, style.white, movie["title"]),
+            (style.info_font, style.white, f"{movie['release_year']} • {movie['genre']}"),
+            (style.rating_font, style.gold, f"⭐ {movie['rating']}"),
+            (style.director_font, style.white, f"🎥 {movie['director']}"),
+        )
+        for font, color, line in lines:
+            metrics = style.metrics_for(font)
+            painter.setFont(font)
+            painter.setPen(color)
+            painter.drawText(
+                QRect(text.left(), y, text.width(), metrics.height()),
+                Qt.AlignLeft | Qt.AlignVCenter,
+                metrics.elidedText(line, Qt.ElideRight, text.width())
+            )
+            y += metrics.height() + 6
+        painter.restore()
+        if DEBUG:
+            self.paints += 1
+            self.paint_seconds += time.perf_counter() - started
+
+    def paint_poster(self, painter, movie_id, card):
+        target = QRect(card.left() + self.PADDING // 2, card.top() + (card.height() - THUMB_HEIGHT) // 2,
+                       THUMB_WIDTH, THUMB_HEIGHT)
+        pixmap = self.posters.pixmap(movie_id)  # starts the background load on first paint
+        if pixmap is not None:
+            painter.drawPixmap(target, pixmap)
+            return
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.style.placeholder)
+        painter.drawRoundedRect(target, 6, 6)
+        painter.setFont(self.style.placeholder_font)
+        painter.setPen(self.style.white)
+        painter.drawText(target, Qt.AlignCenter, "🎬")
+
+
+class MovieGridView(QListView):
+    # 3 cards per row; the view only lays out and paints what is in the viewport
+    COLUMNS = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setUniformItemSizes(True)
+        # the model only holds the pages loaded so far, laying them out in one pass is cheap
+        # and keeps the scrollbar range current for the load-more check in Dashboard
+        self.setLayoutMode(QListView.SinglePass)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self.setStyleSheet("QListView { border: none; background-color: #141414; }")
+
+    def resizeEvent(self, event):
+        width = max(1, (self.viewport().width() - 1) // self.COLUMNS)
+        self.setGridSize(QSize(width, CARD_HEIGHT))
+        super().resizeEvent(event)
 
 
 class MovieDetailsDialog(QDialog):
-    def __init__(self, movie, parent=None):
+    # built once and rebound with bind(), see WidgetPool
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWindowTitle(movie["title"])
         self.resize(400, 300)
 
         layout = QVBoxLayout(self)
 
-        title = QLabel(movie["title"])
-        title.setFont(QFont("Montserrat", 16, QFont.Bold))
-        layout.addWidget(title)
+        self.title = QLabel()
+        self.title.setFont(card_style().dialog_title_font)
+        layout.addWidget(self.title)
 
-        layout.addWidget(QLabel(f"📅 Year: {movie['release_year']}"))
-        layout.addWidget(QLabel(f"🎞 Genre: {movie['genre']}"))
-        layout.addWidget(QLabel(f"⭐ Rating: {movie['rating']}"))
-        layout.addWidget(QLabel(f"🎥 Director: {movie['director']}"))
-        layout.addWidget(QLabel(f"👤 Stars: {movie['star1']}, {movie['star2']}, {movie['star3']}"))
+        self.year = QLabel()
+        self.genre = QLabel()
+        self.rating = QLabel()
+        self.director = QLabel()
+        self.stars = QLabel()
+        for label in (self.year, self.genre, self.rating, self.director, self.stars):
+            layout.addWidget(label)
 
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(self.close)
         layout.addWidget(close_btn)
 
+    def bind(self, movie):
+        self.setWindowTitle(movie["title"])
+        self.title.setText(movie["title"])
+        self.year.setText(f"📅 Year: {movie['release_year']}")
+        self.genre.setText(f"🎞 Genre: {movie['genre']}")
+        self.rating.setText(f"⭐ Rating: {movie['rating']}")
+        self.director.setText(f"🎥 Director: {movie['director']}")
+        self.stars.setText(f"👤 Stars: {movie['star1']}, {movie['star2']}, {movie['star3']}")
+        return self
+
+
+class WidgetPool:
+    # hands out recycled widgets instead of building a new one per use
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self):
+        if self.free:
+            self.reused += 1
+            return self.free.pop()
+        self.created += 1
+        return self.factory()
+
+    def release(self, widget):
+        self.free.append(widget)
+
 
 class Dashboard(QWidget):
-    def __init__(self):
+    # emitted with the row count whenever a page has been put on screen
+    page_shown = Signal(int)
+
+    def __init__(self, backend=None, posters=None):
         super().__init__()
+        # None while the backend is still loading in the background, see set_backend()
+        self.backend = backend
         self.setWindowTitle("CineScope 🎬")
         self.resize(1000, 700)
 
         # 🌑 Dark theme
         self.set_dark_theme()
 
-        # 🔗 Database
-        self.conn = mysql.connector.connect(
-            host="localhost",
-            user="cinescope",
-            password="StrongPass123!",
-            database="cinescope"
-        )
-        self.cursor = self.conn.cursor(dictionary=True)
+        # 🔗 Database queries run on a single background thread, one at a time
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(1)
+        self.pool.setExpiryTimeout(-1)  # keep the thread (and its connection) alive
+        self.search_generation = 0
+        self.searched = False  # whether self.filters has been searched (or is being searched)
+        self.filters = ("", "", "", "")
+        self.last_key = None   # (rating, id) of the last row shown
+        self.has_more = False
+        self.page_loading = False
+        self.requested_at = None  # scrollbar maximum when the last page was requested
+        self.fuzzy = False     # showing closest matches instead of exact ones
+
+        # ⏱ Restarted on every keystroke, searches once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.load_movies)
 
         # Main Layout
         layout = QVBoxLayout(self)
@@ -102,37 +362,60 @@ class Dashboard(QWidget):
 
         self.title_input = QLineEdit()
         self.title_input.setPlaceholderText("Enter movie title...")
-        self.title_input.textChanged.connect(self.load_movies)
+        self.title_input.textChanged.connect(self.search_timer.start)
         form_layout.addRow("Title:", self.title_input)
 
         self.actor_input = QLineEdit()
         self.actor_input.setPlaceholderText("Enter actor name...")
-        self.actor_input.textChanged.connect(self.load_movies)
+        self.actor_input.textChanged.connect(self.search_timer.start)
         form_layout.addRow("Actor:", self.actor_input)
 
         self.genre_input = QLineEdit()
         self.genre_input.setPlaceholderText("Enter genre...")
-        self.genre_input.textChanged.connect(self.load_movies)
+        self.genre_input.textChanged.connect(self.search_timer.start)
         form_layout.addRow("Genre:", self.genre_input)
 
         self.year_input = QLineEdit()
         self.year_input.setPlaceholderText("Enter year...")
-        self.year_input.textChanged.connect(self.load_movies)
+        self.year_input.textChanged.connect(self.search_timer.start)
         form_layout.addRow("Year:", self.year_input)
 
         layout.addLayout(form_layout)
 
-        # Scrollable area
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        layout.addWidget(self.scroll)
-
-        # Container for movie cards
-        self.container = QWidget()
-        self.grid = QGridLayout(self.container)
-        self.scroll.setWidget(self.container)
-
-        # Load movies initially
+        # 📊 Precomputed per-genre/decade/director stats, opened in their own window
+        self.analytics_panel = None
+        analytics_btn = QPushButton("📊 Analytics")
+        analytics_btn.setCursor(Qt.PointingHandCursor)
+        analytics_btn.clicked.connect(self.open_analytics)
+        layout.addWidget(analytics_btn, alignment=Qt.AlignRight)
+
+        # Movie cards, painted on demand by the delegate
+        self.model = MovieListModel(self)
+        self.view = MovieGridView()
+        self.view.setModel(self.model)
+        # 🖼 Posters load on their own pool, cards show a placeholder until theirs arrives
+        self.posters = PosterLoader(posters, parent=self) if posters else None
+        if self.posters is not None:
+            self.posters.updated.connect(self.view.viewport().update)
+        self.delegate = MovieCardDelegate(self.view, self.posters)
+        self.view.setItemDelegate(self.delegate)
+        self.dialogs = WidgetPool(lambda: MovieDetailsDialog(self))
+        self.view.clicked.connect(self.open_details)
+        self.view.verticalScrollBar().valueChanged.connect(self.maybe_load_more)
+        layout.addWidget(self.view)
+
+        # Result count and cache hit/miss counters, handy when tuning the cache
+        self.status = QLabel()
+        self.status.setFont(QFont("Open Sans", 9))
+        layout.addWidget(self.status)
+
+        # Load movies once the window is up, so it shows instantly
+        self.status.setText("Loading movies…")
+        if self.backend is not None:
+            QTimer.singleShot(0, self.load_movies)
+
+    def set_backend(self, backend):
+        self.backend = backend
         self.load_movies()
 
     def set_dark_theme(self):
@@ -147,49 +430,124 @@ class Dashboard(QWidget):
         self.setPalette(palette)
 
     def load_movies(self):
-        base_query = "SELECT * FROM movies"
-        conditions = []
-
-        # Collect conditions from all inputs
-        if self.title_input.text().strip():
-            conditions.append(f"title LIKE '%{self.title_input.text().strip()}%'")
-
-        if self.actor_input.text().strip():
-            actor = self.actor_input.text().strip()
-            conditions.append(f"(star1 LIKE '%{actor}%' OR star2 LIKE '%{actor}%' OR star3 LIKE '%{actor}%')")
-
-        if self.genre_input.text().strip():
-            conditions.append(f"genre LIKE '%{self.genre_input.text().strip()}%'")
-
-        if self.year_input.text().strip():
-            if self.year_input.text().isdigit():
-                conditions.append(f"release_year = {self.year_input.text().strip()}")
-
-        if conditions:
-            base_query += " WHERE " + " AND ".join(conditions)
-
-        self.cursor.execute(base_query)
-        movies = self.cursor.fetchall()
-
-        # Clear grid
-        for i in reversed(range(self.grid.count())):
-            widget = self.grid.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
-
-        # Add movie cards
-        row, col = 0, 0
-        for movie in movies:
-            card = MovieCard(movie)
-            self.grid.addWidget(card, row, col)
-            col += 1
-            if col > 2:  # 3 per row
-                col = 0
-                row += 1
+        filters = normalize_filters(
+            self.title_input.text(),
+            self.actor_input.text(),
+            self.genre_input.text(),
+            self.year_input.text(),
+        )
+        # e.g. a letter typed into Year: same search, keep the pages loaded and the scroll position
+        if self.searched and filters == self.filters:
+            return
+
+        # a search still waiting in the queue is now stale and returns without querying
+        self.search_generation += 1
+
+        self.filters = filters
+        self.last_key = None
+        self.has_more = False
+        self.requested_at = None
+        if self.backend is not None:
+            self.searched = True
+            self.start_search()
+
+    def load_more(self):
+        if self.has_more and not self.page_loading:
+            self.start_search(after=self.last_key)
+
+    def maybe_load_more(self):
+        bar = self.view.verticalScrollBar()
+        # until the rows of the last page are laid out the range is unchanged, so the same
+        # position would still look like the bottom; one page per scroll is enough
+        if bar.maximum() == self.requested_at:
+            return
+        if bar.value() >= bar.maximum() - PREFETCH_MARGIN and self.has_more and not self.page_loading:
+            self.requested_at = bar.maximum()
+            self.load_more()
+
+    def start_search(self, after=None):
+        self.page_loading = True
+        worker = SearchWorker(self.backend, self.search_generation, self.filters, after,
+                              lambda: self.search_generation)
+        worker.signals.finished.connect(self.show_movies)
+        worker.signals.failed.connect(self.show_error)
+        self.pool.start(worker)
+
+    def show_error(self, generation, message):
+        if generation == self.search_generation:
+            self.page_loading = False
+            self.searched = False  # let the same filters be tried again
+            self.status.setText(f"Search failed: {message}")
+
+    def show_movies(self, generation, movies, append, fuzzy=False):
+        # a newer search was started while this one ran, drop its result
+        if generation != self.search_generation:
+            return
+        self.page_loading = False
+        self.fuzzy = fuzzy
+        self.has_more = not fuzzy and len(movies) == PAGE_SIZE  # fuzzy results are a single top-k page
+        if movies:
+            self.last_key = (movies[-1]["rating"], movies[-1]["id"])
+        started, blocks = time.perf_counter(), sys.getallocatedblocks()
+        if append:
+            self.model.append_movies(movies)
+        else:
+            self.model.update_movies(movies)
+            self.view.scrollToTop()
+        if DEBUG:
+            self.report_refresh(len(movies), time.perf_counter() - started, sys.getallocatedblocks() - blocks)
+        self.update_status()
+        self.page_shown.emit(self.model.rowCount())
+        # once the view has laid out the new rows, keep going until the viewport is filled
+        QTimer.singleShot(0, self.maybe_load_more)
+
+    def report_refresh(self, rows, seconds, blocks):
+        # paints happen after this refresh, so they are reported with the next one
+        print(
+            f"[debug] refresh {rows} rows: {seconds * 1000:.2f} ms, {blocks:+d} allocated blocks | "
+            f"paints since last: {self.delegate.paints} in {self.delegate.paint_seconds * 1000:.2f} ms | "
+            f"dialogs created {self.dialogs.created}, reused {self.dialogs.reused}"
+        )
+        self.delegate.paints = 0
+        self.delegate.paint_seconds = 0.0
+
+    def update_status(self):
+        text = f"{self.model.rowCount()}{'+' if self.has_more else ''} movies  •  {self.backend.name}"
+        if self.fuzzy:
+            text = f"No exact match, closest spellings: {text}"
+        cache = getattr(self.backend, "cache", None)
+        if cache is not None:
+            stats = cache.stats()
+            text += (
+                f"  •  cache: {stats['hits']} hits / {stats['misses']} misses, "
+                f"{stats['entries']} entries, {stats['bytes'] // 1024} KB"
+            )
+        self.status.setText(text)
+
+    def open_details(self, index):
+        dlg = self.dialogs.acquire().bind(index.data(MovieListModel.MovieRole))
+        dlg.exec()
+        self.dialogs.release(dlg)
+
+    def open_analytics(self):
+        if self.backend is None:
+            return
+        if self.analytics_panel is None:
+            from analytics_panel import AnalyticsPanel  # only paid for when the panel is used
+            self.analytics_panel = AnalyticsPanel(self.backend, self.pool, self)
+        self.analytics_panel.backend = self.backend
+        self.analytics_panel.load_groups()
+        self.analytics_panel.show()
+        self.analytics_panel.raise_()
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    dashboard = Dashboard()
+    parser = argparse.ArgumentParser(description="CineScope dashboard")
+    add_backend_arguments(parser)
+    add_poster_arguments(parser)
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    dashboard = Dashboard(create_backend(args.backend, args.csv), args.posters)
     dashboard.show()
     sys.exit(app.exec())
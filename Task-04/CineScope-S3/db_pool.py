@@ -0,0 +1,81 @@
+# db_pool.py
+# one MySQL connection pool for the whole process, used by the dashboard and the importer.
+# Connections are health-checked when they are handed out, so a session that sat idle
+# past the server's wait_timeout reconnects instead of failing on the next query
+import os
+import threading
+import time
+import mysql.connector
+from mysql.connector import errors, pooling
+
+DB_NAME = "cinescope_db"
+DB_CONFIG = {
+    "host": os.environ.get("CINESCOPE_DB_HOST", "localhost"),
+    "user": os.environ.get("CINESCOPE_DB_USER", "cinescope"),
+    "password": os.environ.get("CINESCOPE_DB_PASSWORD", "StrongPass123!"),
+}
+POOL_SIZE = int(os.environ.get("CINESCOPE_POOL_SIZE", "2"))
+# how long connection() waits for a free connection before giving up
+ACQUIRE_TIMEOUT = 10
+RECONNECT_ATTEMPTS = 3
+
+_pool = None
+_options = {}
+_lock = threading.Lock()
+
+
+def configure(pool_size=None, **connect_options):
+    # must run before the first connection() call, e.g. the importer enabling allow_local_infile
+    global POOL_SIZE
+    if _pool is not None:
+        raise RuntimeError("connection pool already created")
+    if pool_size is not None:
+        POOL_SIZE = pool_size
+    _options.update(connect_options)
+
+
+def ensure_database():
+    # the pool connects straight into DB_NAME, so it has to exist first
+    conn = mysql.connector.connect(**DB_CONFIG)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}")
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = pooling.MySQLConnectionPool(
+                pool_name="cinescope",
+                pool_size=POOL_SIZE,
+                pool_reset_session=True,
+                database=DB_NAME,
+                **DB_CONFIG,
+                **_options,
+            )
+        return _pool
+
+
+def ensure_alive(conn):
+    # ping() with reconnect re-opens a connection the server dropped (wait_timeout, restart)
+    conn.ping(reconnect=True, attempts=RECONNECT_ATTEMPTS, delay=1)
+
+
+def connection():
+    # a healthy pooled connection; close() hands it back to the pool instead of disconnecting
+    pool = get_pool()
+    deadline = time.monotonic() + ACQUIRE_TIMEOUT
+    while True:
+        try:
+            conn = pool.get_connection()
+            break
+        except errors.PoolError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+    ensure_alive(conn)
+    return conn
@@ -0,0 +1,164 @@
+# fuzzy.py
+# typo-tolerant matching for titles and people, used when a search finds nothing.
+# "shawshenk" or "al pachino" are matched by edit distance, but only against a few candidates:
+# an edit changes at most 3 trigrams, so a text within d edits of the query shares at least
+# one of the query's 3d + 1 rarest trigrams. Only those postings are read, then a cheap
+# trigram count and a bounded edit distance weed out the false positives.
+# import_csv.py stores the trigram index in MySQL (build()); the memory backend uses its TextIndex
+from normalize import insert_many
+
+NGRAM = 3
+MAX_EDITS = 2
+# candidates checked per filter; only queries made entirely of very common trigrams reach it
+MAX_CANDIDATES = 2000
+# fields a term can come from, fuzzy_links.field
+TITLE, DIRECTOR, STAR = 0, 1, 2
+PEOPLE = (DIRECTOR, STAR)
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS fuzzy_terms (
+        id INT PRIMARY KEY,
+        term VARCHAR(255) NOT NULL
+    )
+    """,
+    # utf8mb4_bin keeps accented and plain grams apart, VARCHAR keeps a gram's trailing space
+    """
+    CREATE TABLE IF NOT EXISTS fuzzy_grams (
+        gram VARCHAR(3) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+        term_id INT NOT NULL,
+        PRIMARY KEY (gram, term_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS fuzzy_gram_counts (
+        gram VARCHAR(3) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL PRIMARY KEY,
+        terms INT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS fuzzy_links (
+        term_id INT NOT NULL,
+        field TINYINT NOT NULL,
+        movie_id INT NOT NULL,
+        PRIMARY KEY (term_id, field, movie_id)
+    )
+    """,
+]
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+def ngrams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def max_distance(query):
+    # one typo per four characters, as long as the trigram filter can still guarantee a hit
+    return max(0, min(MAX_EDITS, len(query) // 4, (len(query) - NGRAM) // NGRAM))
+
+
+def probe_grams(grams, frequency, distance):
+    # the 3d + 1 rarest grams, one of which every match must contain
+    return sorted(grams, key=frequency)[:NGRAM * distance + 1]
+
+
+def substring_distance(query, text, limit):
+    # fewest edits turning query into some substring of text, or None if more than limit.
+    # Myers' bit-parallel algorithm: one column of the edit distance table per text character,
+    # kept as bit vectors of +1/-1 steps in python ints
+    size = len(query)
+    if not size:
+        return 0
+    matches = {}
+    for i, char in enumerate(query):
+        matches[char] = matches.get(char, 0) | (1 << i)
+    mask = (1 << size) - 1
+    last = 1 << (size - 1)
+    up, down, score = mask, 0, size
+    best = size
+    for char in text:
+        eq = matches.get(char, 0)
+        xv = eq | down
+        xh = (((eq & up) + up) ^ up) | eq
+        right = down | (~(xh | up) & mask)
+        left = up & xh
+        if right & last:
+            score += 1
+        elif left & last:
+            score -= 1
+        right = (right << 1) & mask  # no carry in: a match may start at any text position
+        left = (left << 1) & mask
+        up = left | (~(xv | right) & mask)
+        down = right & xv
+        if score < best:
+            best = score
+    return best if best <= limit else None
+
+
+def verify(query, grams, distance, text):
+    # trigram count filter first, it rejects most candidates without the quadratic distance
+    if len(grams) - len(grams & ngrams(text)) > NGRAM * distance:
+        return None
+    return substring_distance(query, text, distance)
+
+
+def combine(*hits):
+    # movie -> summed distance, for movies matched by every fuzzy filter in use
+    hits = [h for h in hits if h is not None]
+    if not hits:
+        return {}
+    combined = dict(hits[0])
+    for other in hits[1:]:
+        combined = {movie: distance + other[movie] for movie, distance in combined.items() if movie in other}
+    return combined
+
+
+def matches_filters(movie, genre, year):
+    # the exact filters that still apply to fuzzy results
+    if year and movie["release_year"] != int(year):
+        return False
+    if genre:
+        return any(name.strip().lower().startswith(genre) for name in (movie["genre"] or "").split(","))
+    return True
+
+
+def rank(movies, distances, limit):
+    # closest first, then best rated, the same tie-break as every other search
+    movies.sort(key=lambda m: (distances[m["id"]], -(m["rating"] if m["rating"] is not None else -1), -m["id"]))
+    return movies[:limit]
+
+
+def create_tables(cursor):
+    for statement in SCHEMA:
+        cursor.execute(statement)
+
+
+def build(conn, cursor, batch_size=1000):
+    # full rebuild from the movies table, run by import_csv.py after every import
+    create_tables(cursor)
+    for table in ("fuzzy_terms", "fuzzy_grams", "fuzzy_gram_counts", "fuzzy_links"):
+        cursor.execute(f"TRUNCATE TABLE {table}")
+
+    cursor.execute("SELECT id, title, director, star1, star2, star3 FROM movies")
+    term_ids, links = {}, set()
+    for movie_id, title, director, *stars in cursor.fetchall():
+        for field, text in ((TITLE, title), (DIRECTOR, director), *((STAR, star) for star in stars)):
+            term = normalize(text or "")[:255]
+            if len(term) >= NGRAM:
+                links.add((term_ids.setdefault(term, len(term_ids) + 1), field, movie_id))
+
+    counts = {}
+    grams = []
+    for term, term_id in term_ids.items():
+        for gram in ngrams(term):
+            grams.append((gram, term_id))
+            counts[gram] = counts.get(gram, 0) + 1
+    insert_many(cursor, "fuzzy_terms", ["id", "term"], [(i, t) for t, i in term_ids.items()], batch_size)
+    insert_many(cursor, "fuzzy_grams", ["gram", "term_id"], grams, batch_size)
+    insert_many(cursor, "fuzzy_gram_counts", ["gram", "terms"], list(counts.items()), batch_size)
+    insert_many(cursor, "fuzzy_links", ["term_id", "field", "movie_id"], sorted(links), batch_size)
+    conn.commit()
+    return len(term_ids)
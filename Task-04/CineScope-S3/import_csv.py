@@ -1,56 +1,532 @@
-# import_csv.py
+import argparse
 import csv
-import mysql.connector
+import hashlib
+import io
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from mysql.connector import errors
+
+import analytics
+import db_pool
+import fuzzy
+import normalize
+import snapshot
 
-DB_NAME = "cinescope_db"
 TABLE_NAME = "movies"
+STATE_TABLE = "import_state"
+VERSION_TABLE = "catalogue_version"
+CSV_FILE = "movies.csv"
+
+CSV_FIELDS = ("Series_Title", "Released_Year", "Genre", "IMDB_Rating", "Director", "Star1", "Star2", "Star3")
+COLUMNS = ("title", "release_year", "genre", "rating", "director", "star1", "star2", "star3", "content_hash")
+ROW_PLACEHOLDER = "(" + ", ".join(["%s"] * len(COLUMNS)) + ")"
+# (title, release_year) is the natural key, so re-importing updates rows instead of duplicating them.
+# The unique key is on year_key, release_year with NULL as 0, so yearless movies are not repeated either
+UPSERT = "ON DUPLICATE KEY UPDATE " + ", ".join(f"{c} = VALUES({c})" for c in COLUMNS[2:])
+
+# secondary indexes the dashboard filters rely on, added to older tables by upgrade_movies_table
+INDEXES = {
+    "idx_release_year": "INDEX idx_release_year (release_year)",
+    "idx_rating": "INDEX idx_rating (rating)",
+    "ft_title": "FULLTEXT INDEX ft_title (title)",
+    "ft_stars": "FULLTEXT INDEX ft_stars (star1, star2, star3)",
+    "ft_director": "FULLTEXT INDEX ft_director (director)",
+}
+INDEX_DEFINITIONS = ",\n        ".join(INDEXES.values())
+
+# parallel mode: bytes of CSV per parse task, and how much work may wait between the stages
+CHUNK_BYTES = 4 * 1024 * 1024
+SCAN_BLOCK = 1024 * 1024
+TASKS_PER_WORKER = 2
+BATCHES_PER_WRITER = 4
+DEADLOCK_RETRIES = 5
+QUEUE_POLL = 0.5  # seconds between checks for a failed writer while the queue is full or empty
+
+
+def connect(allow_local_infile=False, pool_size=None):
+    # same pool and credentials as the dashboard
+    db_pool.configure(pool_size=pool_size, allow_local_infile=allow_local_infile)
+    db_pool.ensure_database()
+    return db_pool.connection()
+
+
+def create_schema(cursor):
+    # the database itself is created by db_pool.ensure_database()
+    # create movies table
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        title VARCHAR(255),
+        release_year INT,
+        genre VARCHAR(100),
+        rating DECIMAL(3, 1),
+        director VARCHAR(255),
+        star1 VARCHAR(255),
+        star2 VARCHAR(255),
+        star3 VARCHAR(255),
+        content_hash CHAR(32),
+        year_key INT AS (IFNULL(release_year, 0)) STORED,
+        UNIQUE KEY uq_title_year (title, year_key),
+        {INDEX_DEFINITIONS}
+    )
+    """)
+
+    # remembers the checksum of the last file that was synced successfully
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        source VARCHAR(512),
+        checksum CHAR(64),
+        row_count INT,
+        imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    # bumped after every import that changed something, the dashboard's search cache watches it
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (
+        id TINYINT PRIMARY KEY,
+        version INT NOT NULL
+    )
+    """)
+
+    upgrade_movies_table(cursor)
+
+
+def upgrade_movies_table(cursor):
+    # tables created by older versions have no hash column and no natural key
+    cursor.execute(f"SHOW COLUMNS FROM {TABLE_NAME} LIKE 'content_hash'")
+    if not cursor.fetchall():
+        cursor.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN content_hash CHAR(32)")
+
+    # FLOAT ratings can't be compared for equality, which the dashboard's keyset pages need
+    cursor.execute(f"SHOW COLUMNS FROM {TABLE_NAME} LIKE 'rating'")
+    column = cursor.fetchone()
+    if column and str(column[1]).lower().startswith("float"):
+        cursor.execute(f"ALTER TABLE {TABLE_NAME} MODIFY rating DECIMAL(3, 1)")
+
+    # a unique key lets any number of NULLs through, so movies without a year are keyed on 0
+    cursor.execute(f"SHOW COLUMNS FROM {TABLE_NAME} LIKE 'year_key'")
+    if not cursor.fetchall():
+        cursor.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN year_key INT AS (IFNULL(release_year, 0)) STORED")
+        cursor.execute(f"SHOW INDEX FROM {TABLE_NAME} WHERE Key_name = 'uq_title_year'")
+        if cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {TABLE_NAME} DROP INDEX uq_title_year")
+
+    cursor.execute(f"SHOW INDEX FROM {TABLE_NAME} WHERE Key_name = 'uq_title_year'")
+    if not cursor.fetchall():
+        # drop the copies left behind by earlier append-only runs (or yearless repeats), keeping the oldest row
+        cursor.execute(f"""
+            DELETE newer FROM {TABLE_NAME} newer
+            JOIN {TABLE_NAME} older
+              ON newer.title = older.title
+             AND newer.year_key = older.year_key
+             AND newer.id > older.id
+        """)
+        cursor.execute(f"ALTER TABLE {TABLE_NAME} ADD UNIQUE KEY uq_title_year (title, year_key)")
+
+    cursor.execute(f"SHOW INDEX FROM {TABLE_NAME}")
+    existing = {index[2] for index in cursor.fetchall()}
+    for name, definition in INDEXES.items():
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {TABLE_NAME} ADD {definition}")
 
-conn = mysql.connector.connect(
-    host="localhost",
-    user="cinescope",
-    password="StrongPass123!",
-)
-cursor = conn.cursor()
-
-# create DB if not exists
-cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}")
-cursor.execute(f"USE {DB_NAME}")
-
-# create movies table
-cursor.execute(f"""
-CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
-    id INT AUTO_INCREMENT PRIMARY KEY,
-    title VARCHAR(255),
-    release_year INT,
-    genre VARCHAR(100),
-    rating FLOAT,
-    director VARCHAR(255),
-    star1 VARCHAR(255),
-    star2 VARCHAR(255),
-    star3 VARCHAR(255)
-)
-""")
-
-# insert from CSV
-with open("movies.csv", "r", encoding="utf-8") as f:
-    reader = csv.DictReader(f)
-    for row in reader:
+
+def row_hash(row):
+    # hash of the raw CSV fields, so LOAD DATA can compute the same value server side
+    raw = "\x1f".join(row[field] for field in CSV_FIELDS)
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def parse_row(row):
+    return (
+        row["Series_Title"],
+        int(row["Released_Year"]) if row["Released_Year"].isdigit() else None,
+        row["Genre"],
+        float(row["IMDB_Rating"]) if row["IMDB_Rating"] else None,
+        row["Director"],
+        row["Star1"],
+        row["Star2"],
+        row["Star3"],
+        row_hash(row)
+    )
+
+
+def read_rows(path):
+    if snapshot.is_snapshot(path):
+        yield from snapshot.read_rows(path)  # same tuples, without parsing any text
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield parse_row(row)
+
+
+def insert_batch(cursor, batch):
+    # one multi-row INSERT per batch instead of one round trip per movie
+    values = ", ".join([ROW_PLACEHOLDER] * len(batch))
+    params = [value for row in batch for value in row]
+    cursor.execute(
+        f"INSERT INTO {TABLE_NAME} ({', '.join(COLUMNS)}) VALUES {values} {UPSERT}",
+        params
+    )
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def import_per_row(conn, cursor, path):
+    count = 0
+    for row in read_rows(path):
         cursor.execute(f"""
-            INSERT INTO {TABLE_NAME} 
-            (title, release_year, genre, rating, director, star1, star2, star3)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            row["Series_Title"],
-            int(row["Released_Year"]) if row["Released_Year"].isdigit() else None,
-            row["Genre"],
-            float(row["IMDB_Rating"]) if row["IMDB_Rating"] else None,
-            row["Director"],
-            row["Star1"],
-            row["Star2"],
-            row["Star3"]
-        ))
-
-conn.commit()
-cursor.close()
-conn.close()
-print("Movies imported successfully ✅")
+            INSERT INTO {TABLE_NAME}
+            ({', '.join(COLUMNS)})
+            VALUES {ROW_PLACEHOLDER}
+            {UPSERT}
+        """, row)
+        count += 1
+    conn.commit()
+    return count
+
+
+def import_batched(conn, cursor, path, batch_size):
+    count = 0
+    batch = []
+    for row in read_rows(path):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            insert_batch(cursor, batch)
+            conn.commit()  # commit per chunk so a failure only loses the current batch
+            count += len(batch)
+            batch = []
+    if batch:
+        insert_batch(cursor, batch)
+        conn.commit()
+        count += len(batch)
+    return count
+
+
+def record_ranges(path, chunk_bytes=CHUNK_BYTES):
+    # (start, end) byte ranges of about chunk_bytes that begin and end on record boundaries.
+    # A newline only ends a record when an even number of quotes precede it, so quoted
+    # newlines never split a row. Only quotes are counted here, nothing is parsed.
+    with open(path, "rb") as f:
+        f.readline()  # header
+        start = position = f.tell()
+        in_quotes = False
+        for block in iter(lambda: f.read(SCAN_BLOCK), b""):
+            i = 0  # quotes are counted up to block[i]
+            while True:
+                target = max(i, start + chunk_bytes - position)
+                end = block.find(b"\n", target) if target < len(block) else -1
+                if end < 0:
+                    break
+                in_quotes ^= block.count(b'"', i, end) & 1
+                i = end + 1
+                if not in_quotes:
+                    yield start, position + i
+                    start = position + i
+            in_quotes ^= block.count(b'"', i) & 1
+            position += len(block)
+        if position > start:
+            yield start, position
+
+
+def parse_range(path, fieldnames, start, end):
+    # runs in a worker process: parse and validate one range, bad rows are counted and skipped
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    rows, rejected = [], 0
+    for row in csv.DictReader(io.StringIO(text, newline=""), fieldnames=fieldnames):
+        if None in row or None in row.values():
+            rejected += 1  # too many or too few fields
+            continue
+        try:
+            rows.append(parse_row(row))
+        except ValueError:
+            rejected += 1
+    return rows, rejected
+
+
+def write_batches(batches, failures):
+    # writer thread: its own pooled connection, commits every batch it takes off the queue.
+    # Any failure, including a connection that cannot be opened or drops (InterfaceError),
+    # lands in `failures`, which stops the reader and the other writers
+    conn = cursor = None
+    try:
+        conn = db_pool.connection()
+        cursor = conn.cursor()
+        while True:
+            try:
+                batch = batches.get(timeout=QUEUE_POLL)
+            except queue.Empty:
+                if failures:
+                    return
+                continue
+            if batch is None or failures:
+                return
+            for attempt in range(DEADLOCK_RETRIES):
+                try:
+                    insert_batch(cursor, batch)
+                    conn.commit()
+                    break
+                except errors.DatabaseError as e:
+                    # concurrent upserts can deadlock on the unique key, InnoDB rolled this batch back
+                    conn.rollback()
+                    if e.errno != 1213 or attempt == DEADLOCK_RETRIES - 1:
+                        raise
+    except Exception as e:
+        failures.append(e)
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass  # already broken, the original failure is what gets reported
+
+
+def put_batch(batches, item, failures, threads):
+    # a blocking put would wait forever once the writers are gone, so give up on a failure
+    while True:
+        try:
+            batches.put(item, timeout=QUEUE_POLL)
+            return True
+        except queue.Full:
+            if failures or not any(thread.is_alive() for thread in threads):
+                return False
+
+
+def import_parallel(path, batch_size, workers, writers):
+    # ranges are parsed in a process pool and handed over in file order to `writers` threads
+    # through a bounded queue; at most TASKS_PER_WORKER ranges per worker and
+    # BATCHES_PER_WRITER batches per writer are in memory, whatever the file size
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        fieldnames = next(csv.reader(f))
+    batches = queue.Queue(maxsize=writers * BATCHES_PER_WRITER)
+    failures = []
+    threads = [threading.Thread(target=write_batches, args=(batches, failures)) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+
+    count = rejected = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            ranges = record_ranges(path)
+            pending = deque()
+            while not failures:
+                while len(pending) < workers * TASKS_PER_WORKER:
+                    next_range = next(ranges, None)
+                    if next_range is None:
+                        break
+                    pending.append(executor.submit(parse_range, path, fieldnames, *next_range))
+                if not pending:
+                    break
+                rows, bad = pending.popleft().result()
+                rejected += bad
+                for i in range(0, len(rows), batch_size):
+                    if not put_batch(batches, rows[i:i + batch_size], failures, threads):
+                        break
+                count += len(rows)
+            for future in pending:
+                future.cancel()
+    finally:
+        for _ in threads:
+            if not put_batch(batches, None, failures, threads):
+                break  # the writers stop by themselves once a failure is recorded
+        for thread in threads:
+            thread.join()
+    if failures:
+        raise failures[0]
+    if rejected:
+        print(f"{rejected} malformed rows skipped")
+    return count
+
+
+def local_infile_enabled(cursor):
+    cursor.execute("SHOW VARIABLES LIKE 'local_infile'")
+    result = cursor.fetchone()
+    return bool(result) and str(result[1]).upper() in ("ON", "1")
+
+
+def count_records(path):
+    # newline count is enough for the rows/s report and much cheaper than parsing
+    with open(path, "rb") as f:
+        lines = sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b""))
+    return max(0, lines - 1)
+
+
+def line_terminator(path):
+    # the header line tells whether the file uses CRLF (movies.csv does) or LF line endings
+    with open(path, "rb") as f:
+        header = f.readline()
+    return "\\r\\n" if header.endswith(b"\r\n") else "\\n"
+
+
+def import_infile(conn, cursor, path):
+    # the server parses the CSV itself; numeric columns are cleaned the same way parse_row does.
+    # With the wrong terminator every star3 would keep a trailing \r and never match row_hash
+    cursor.execute(f"""
+        LOAD DATA LOCAL INFILE %s
+        REPLACE INTO TABLE {TABLE_NAME}
+        CHARACTER SET utf8mb4
+        FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+        LINES TERMINATED BY '{line_terminator(path)}'
+        IGNORE 1 LINES
+        (@title, @release_year, @genre, @rating, @director, @star1, @star2, @star3)
+        SET title = @title,
+            release_year = IF(@release_year REGEXP '^[0-9]+$', @release_year, NULL),
+            genre = @genre,
+            rating = NULLIF(@rating, ''),
+            director = @director,
+            star1 = @star1, star2 = @star2, star3 = @star3,
+            content_hash = MD5(CONCAT_WS(0x1f, @title, @release_year, @genre, @rating,
+                                         @director, @star1, @star2, @star3))
+    """, (os.path.abspath(path),))
+    conn.commit()
+    return count_records(path)
+
+
+def import_sync(conn, cursor, path, batch_size):
+    source = os.path.abspath(path)
+    checksum = file_checksum(path)
+
+    # fast path: nothing to do if this exact file was already synced
+    cursor.execute(
+        f"SELECT checksum FROM {STATE_TABLE} WHERE source = %s ORDER BY id DESC LIMIT 1",
+        (source,)
+    )
+    last = cursor.fetchone()
+    if last and last[0] == checksum:
+        print("File unchanged since last sync, skipping")
+        return 0
+
+    cursor.execute(f"SELECT id, title, release_year, content_hash FROM {TABLE_NAME}")
+    existing = {(title, year): (movie_id, digest) for movie_id, title, year, digest in cursor.fetchall()}
+
+    inserts, updates = [], []
+    inserted = updated = count = 0
+
+    def flush():
+        if inserts:
+            insert_batch(cursor, inserts)
+        if updates:
+            cursor.executemany(
+                f"UPDATE {TABLE_NAME} SET {', '.join(f'{c} = %s' for c in COLUMNS)} WHERE id = %s",
+                updates
+            )
+        conn.commit()
+        inserts.clear()
+        updates.clear()
+
+    for row in read_rows(path):
+        count += 1
+        key = (row[0], row[1])
+        current = existing.get(key)
+        if current is None:
+            inserts.append(row)
+            inserted += 1
+        elif current[1] != row[-1]:
+            if current[0] is None:
+                inserts.append(row)  # repeated key within the file, the upsert keeps the last one
+            else:
+                updates.append(row + (current[0],))
+                updated += 1
+        existing[key] = (current[0] if current else None, row[-1])
+        if len(inserts) + len(updates) >= batch_size:
+            flush()
+    flush()
+
+    cursor.execute(
+        f"INSERT INTO {STATE_TABLE} (source, checksum, row_count) VALUES (%s, %s, %s)",
+        (source, checksum, count)
+    )
+    conn.commit()
+    print(f"{inserted} inserted, {updated} updated, {count - inserted - updated} unchanged")
+    return count
+
+
+def bump_catalogue_version(conn, cursor):
+    cursor.execute(f"""
+        INSERT INTO {VERSION_TABLE} (id, version) VALUES (1, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1
+    """)
+    conn.commit()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import movies.csv into the CineScope database")
+    parser.add_argument("--csv", default=CSV_FILE, help="CSV file (or snapshot.py snapshot) to import")
+    parser.add_argument(
+        "--mode", choices=["row", "batch", "infile", "sync", "parallel"], default="batch",
+        help="row = one INSERT per movie, batch = multi-row INSERTs, infile = LOAD DATA LOCAL INFILE, "
+             "sync = only write rows whose content changed, parallel = parse in a process pool"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="rows per INSERT/commit in batch, sync and parallel mode")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parser processes in parallel mode")
+    parser.add_argument("--writers", type=int, default=1,
+                        help="writer connections in parallel mode (ids follow file order only with one)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    writers = max(1, args.writers)
+    conn = connect(allow_local_infile=args.mode == "infile", pool_size=writers + 1 if args.mode == "parallel" else None)
+    cursor = conn.cursor()
+    create_schema(cursor)
+    normalize.create_tables(cursor)
+
+    mode = args.mode
+    if mode in ("infile", "parallel") and snapshot.is_snapshot(args.csv):
+        print(f"{mode} mode needs the CSV, importing the snapshot in batch mode")
+        mode = "batch"
+    elif mode == "infile" and not local_infile_enabled(cursor):
+        print("Server has local_infile disabled, falling back to batch mode")
+        mode = "batch"
+
+    start = time.perf_counter()
+    if mode == "row":
+        count = import_per_row(conn, cursor, args.csv)
+    elif mode == "batch":
+        count = import_batched(conn, cursor, args.csv, max(1, args.batch_size))
+    elif mode == "sync":
+        count = import_sync(conn, cursor, args.csv, max(1, args.batch_size))
+    elif mode == "parallel":
+        count = import_parallel(args.csv, max(1, args.batch_size), max(1, args.workers), writers)
+    else:
+        count = import_infile(conn, cursor, args.csv)
+    elapsed = time.perf_counter() - start
+
+    if count:
+        stage_start = time.perf_counter()
+        genre_links, cast_links = normalize.build(conn, cursor, max(1, args.batch_size))
+        print(f"Normalized {genre_links} genre and {cast_links} cast links in {time.perf_counter() - stage_start:.2f}s")
+        stage_start = time.perf_counter()
+        groups = analytics.build(conn, cursor)
+        print(f"Precomputed analytics for {groups} groups in {time.perf_counter() - stage_start:.2f}s")
+        stage_start = time.perf_counter()
+        terms = fuzzy.build(conn, cursor, max(1, args.batch_size))
+        print(f"Indexed {terms} terms for fuzzy search in {time.perf_counter() - stage_start:.2f}s")
+        bump_catalogue_version(conn, cursor)
+
+    cursor.close()
+    conn.close()
+    print("Movies imported successfully ✅")
+    print(f"{count} rows in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.0f} rows/s, mode={mode})")
+
+
+if __name__ == "__main__":
+    main()
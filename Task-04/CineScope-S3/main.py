@@ -1,16 +1,76 @@
+import time
+STARTED = time.perf_counter()  # before any heavy import, for --profile-startup
+
+import argparse
 import sys
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QSpacerItem, QSizePolicy
 )
 from PySide6.QtGui import QFont, QMovie
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, Signal
+
+# dashboard, mysql.connector and the catalogue are loaded by Preloader after the cover page paints
+from backends import add_backend_arguments, create_backend
+from posters import add_poster_arguments
+
+
+class StartupProfile:
+    # timestamps of the startup milestones, printed by --profile-startup
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.marks = []
+
+    def mark(self, name):
+        if self.enabled and name not in (n for n, _ in self.marks):
+            self.marks.append((name, time.perf_counter() - STARTED))
+
+    def report(self):
+        print("Startup profile (ms since process start):")
+        for name, seconds in self.marks:
+            print(f"  {name:<24} {seconds * 1000:8.1f}")
+        self.enabled = False  # later pages don't need reporting
+
+
+class PreloadSignals(QObject):
+    finished = Signal(object)
+    failed = Signal(str)
+
 
-from dashboard import Dashboard
+class Preloader(QRunnable):
+    # imports the dashboard and builds the backend (DB driver, connection, CSV) off the GUI thread
+    def __init__(self, backend_name, csv_path, profile):
+        super().__init__()
+        self.backend_name = backend_name
+        self.csv_path = csv_path
+        self.profile = profile
+        self.signals = PreloadSignals()
+
+    def run(self):
+        try:
+            import dashboard  # noqa: F401
+            self.profile.mark("dashboard imported")
+            backend = create_backend(self.backend_name, self.csv_path)
+            if hasattr(backend, "warm_up"):
+                backend.warm_up()
+            self.profile.mark("backend ready")
+        except Exception as e:  # shown on the cover page instead of killing the thread
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(backend)
 
 
 class CoverPage(QWidget):
-    def __init__(self):
+    backend_failed = Signal(str)
+
+    def __init__(self, backend_name="mysql", csv_path="movies.csv", profile=None, posters=None):
         super().__init__()
+        self.backend_name = backend_name
+        self.csv_path = csv_path
+        self.posters = posters
+        self.profile = profile or StartupProfile(False)
+        self.backend = None
+        self.backend_error = None  # message of a failed preload, shown by a dashboard opened later
+        self.dashboard = None
         self.setWindowTitle("CineScope – Movie Explorer")
         self.resize(1200, 800)
         self.setMinimumSize(800, 600)
@@ -66,18 +126,77 @@ class CoverPage(QWidget):
 
         layout.addWidget(start_btn, alignment=Qt.AlignCenter)
 
+        self.load_status = QLabel("")
+        self.load_status.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.load_status)
+
         layout.addSpacerItem(QSpacerItem(20, 60, QSizePolicy.Minimum, QSizePolicy.Expanding))
 
+    def start_preload(self):
+        # called once the cover page is on screen
+        self.profile.mark("cover page shown")
+        preloader = Preloader(self.backend_name, self.csv_path, self.profile)
+        preloader.signals.finished.connect(self.on_backend_ready)
+        preloader.signals.failed.connect(self.on_backend_failed)
+        QThreadPool.globalInstance().start(preloader)
+
+    def on_backend_ready(self, backend):
+        # kept and reused, so reopening the dashboard keeps its connection, cache and indexes
+        self.backend = backend
+        if self.dashboard is not None and self.dashboard.backend is None:
+            self.dashboard.set_backend(backend)
+
+    def on_backend_failed(self, message):
+        self.profile.mark("backend failed")
+        self.backend_error = message
+        self.load_status.setText(f"Could not load movies: {message}")
+        if self.dashboard is not None:
+            self.dashboard.status.setText(f"Could not load movies: {message}")
+        print(f"Backend failed to load: {message}")
+        self.backend_failed.emit(message)
+
     def on_start(self):
         print("triggered")
-        self.dashboard = Dashboard()
+        from dashboard import Dashboard  # usually already imported by the preloader
+
+        # the window shows right away, with a loading state until the backend is ready
+        self.dashboard = Dashboard(self.backend, self.posters)
+        self.dashboard.page_shown.connect(lambda _: self.profile.mark("first page shown"))
+        if self.backend is None and self.backend_error is not None:
+            self.dashboard.status.setText(f"Could not load movies: {self.backend_error}")
         self.close()
         self.dashboard.show()
-        
+        self.profile.mark("dashboard shown")
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = CoverPage()
+    parser = argparse.ArgumentParser(description="CineScope – Movie Explorer")
+    add_backend_arguments(parser)
+    add_poster_arguments(parser)
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="open the dashboard automatically, print startup timings and exit")
+    args, qt_args = parser.parse_known_args()
+
+    profile = StartupProfile(args.profile_startup)
+    profile.mark("python + Qt imported")
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = CoverPage(args.backend, args.csv, profile, args.posters)
     window.show()
+    QTimer.singleShot(0, window.start_preload)
+
+    if args.profile_startup:
+        def finish(_):
+            if profile.enabled:
+                profile.report()
+                app.quit()
+
+        def open_dashboard():
+            window.on_start()
+            window.dashboard.page_shown.connect(finish)
+            window.backend_failed.connect(finish)
+            if window.backend_error is not None:
+                finish(window.backend_error)
+
+        QTimer.singleShot(0, open_dashboard)
+
     sys.exit(app.exec())
@@ -0,0 +1,231 @@
+# memory_backend.py
+# offline search straight from movies.csv (or its snapshot.py snapshot), no MySQL server needed.
+# Movies are stored as columns (compact arrays plus dictionary-encoded strings), sorted
+# once by (rating DESC, id DESC) so a row's position is also its rank in the results.
+# Every index is a sorted list of positions, which makes each page a bisect plus a short walk.
+import re
+from array import array
+from bisect import bisect_left
+
+import fuzzy
+from analytics import summarize
+from query_builder import PAGE_SIZE, fulltext_terms
+from snapshot import NONE, Snapshot, encode, is_snapshot, read_csv_columns
+
+NGRAM = 3
+SHORT_MAX = NGRAM - 1  # shorter substrings have their own index of 1- and 2-character grams
+
+
+def ngrams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def short_grams(text):
+    return {text[i:i + n] for n in range(1, SHORT_MAX + 1) for i in range(len(text) - n + 1)}
+
+
+def starts_words(text, terms):
+    # FULLTEXT's "+term*": every term begins some word of the text
+    words = re.findall(r"\w+", text)
+    return all(any(word.startswith(term) for word in words) for term in terms)
+
+
+def contains(postings, position):
+    i = bisect_left(postings, position)
+    return i < len(postings) and postings[i] == position
+
+
+def intersect(lists, start=0, predicate=None, limit=None):
+    # walk the shortest list and probe the others, stopping as soon as `limit` matches are found
+    lists = sorted(lists, key=len)
+    driver, others = lists[0], lists[1:]
+    found = []
+    for i in range(bisect_left(driver, start), len(driver)):
+        position = driver[i]
+        if all(contains(other, position) for other in others) and (predicate is None or predicate(position)):
+            found.append(position)
+            if limit is not None and len(found) >= limit:
+                break
+    return found
+
+
+class TextIndex:
+    # n-gram postings over a list of lowercase strings
+    def __init__(self, texts):
+        self.texts = texts
+        grams, short = {}, {}
+        for key, text in enumerate(texts):
+            for gram in ngrams(text):
+                grams.setdefault(gram, array("i")).append(key)
+            for gram in short_grams(text):
+                short.setdefault(gram, array("i")).append(key)
+        self.grams = grams
+        self.short = short
+
+    def postings(self, query):
+        # candidate lists whose intersection contains every match, plus a check for false positives.
+        # Same rule as query_builder.text_condition: word prefixes where MySQL would use
+        # FULLTEXT, substrings where it falls back to LIKE
+        terms = fulltext_terms(query)
+        if terms:
+            lists = [self.grams.get(gram, array("i")) for term in terms for gram in ngrams(term)]
+            return lists, lambda key: starts_words(self.texts[key], terms)
+        if len(query) <= SHORT_MAX:
+            return [self.short.get(query, array("i"))], None
+        grams = ngrams(query)
+        return [self.grams.get(gram, array("i")) for gram in grams], lambda key: query in self.texts[key]
+
+    def search(self, query):
+        lists, predicate = self.postings(query)
+        return intersect(lists, predicate=predicate)
+
+    def fuzzy(self, query):
+        # key -> edit distance for texts containing a near match of query, see fuzzy.py
+        distance = fuzzy.max_distance(query)
+        grams = ngrams(query)
+        probes = fuzzy.probe_grams(grams, lambda gram: len(self.grams.get(gram, ())), distance)
+        candidates = set()
+        for gram in probes:  # rarest first; keys are in rank order, so a cut keeps the best rated
+            candidates.update(self.grams.get(gram, ())[:fuzzy.MAX_CANDIDATES - len(candidates)])
+            if len(candidates) >= fuzzy.MAX_CANDIDATES:
+                break
+        found = {}
+        for key in candidates:
+            match = fuzzy.verify(query, grams, distance, self.texts[key])
+            if match is not None:
+                found[key] = match
+        return found
+
+
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, csv_path="movies.csv"):
+        # csv_path may also be a snapshot written by snapshot.py, which skips parsing entirely
+        if is_snapshot(csv_path):
+            self.load_snapshot(csv_path)
+        else:
+            self.load_csv(csv_path)
+        self.position = {movie_id: position for position, movie_id in enumerate(self.ids)}
+        self.build_indexes()
+        self.summaries = {}  # dimension -> (summary rows, top movies per group), built on first use
+
+    def load_csv(self, csv_path):
+        rows = read_csv_columns(csv_path)
+
+        # columns, one entry per position
+        self.ratings = array("h", (r[0] for r in rows))  # tenths, like DECIMAL(3, 1)
+        self.ids = array("i", (r[1] for r in rows))
+        self.titles = [r[2] for r in rows]
+        self.years = array("h", (r[3] for r in rows))
+        self.genre_names, self.genres = encode(r[4] for r in rows)
+        self.director_names, self.directors = encode(r[5] for r in rows)
+        self.people, self.cast = encode(name for r in rows for name in r[6])  # three person codes per position
+
+    def load_snapshot(self, path):
+        # same columns as load_csv, as zero-copy views into the mapped file
+        snapshot = Snapshot(path)
+        self.ratings = snapshot.numeric("ratings", as_numpy=False)
+        self.ids = snapshot.numeric("ids", as_numpy=False)
+        self.titles = snapshot.text("titles")
+        self.years = snapshot.numeric("years", as_numpy=False)
+        self.genre_names, self.genres = snapshot.dictionary("genres", as_numpy=False)
+        self.director_names, self.directors = snapshot.dictionary("directors", as_numpy=False)
+        self.people, self.cast = snapshot.dictionary("cast", as_numpy=False)
+
+    def build_indexes(self):
+        self.title_index = TextIndex([title.lower() for title in self.titles])
+        self.people_index = TextIndex([name.lower() for name in self.people])
+        self.director_index = TextIndex([name.lower() for name in self.director_names])
+        self.movies_by_person = {}
+        for i, person in enumerate(self.cast):
+            postings = self.movies_by_person.setdefault(person, array("i"))
+            if self.people[person] and (not postings or postings[-1] != i // 3):
+                postings.append(i // 3)
+        self.movies_by_director = {}
+        for position, code in enumerate(self.directors):
+            self.movies_by_director.setdefault(code, array("i")).append(position)
+        self.movies_by_genre = {}
+        for position, code in enumerate(self.genres):
+            for name in self.genre_names[code].split(","):
+                if name.strip():
+                    self.movies_by_genre.setdefault(name.strip().lower(), array("i")).append(position)
+        self.movies_by_year = {}
+        for position, year in enumerate(self.years):
+            self.movies_by_year.setdefault(year, array("i")).append(position)
+
+    def union(self, index, keys):
+        lists = [index[key] for key in keys if key in index]
+        if len(lists) == 1:
+            return lists[0]
+        return array("i", sorted({position for postings in lists for position in postings}))
+
+    def search(self, filters, after=None, limit=PAGE_SIZE):
+        title, actor, genre, year = filters
+        start = self.position[after[1]] + 1 if after else 0
+        lists, predicates = [], []
+
+        if title:
+            title_lists, predicate = self.title_index.postings(title)
+            lists.extend(title_lists)
+            if predicate:
+                predicates.append(predicate)
+        if actor:
+            lists.append(self.union(self.movies_by_person, self.people_index.search(actor)))
+        if genre:
+            lists.append(self.union(self.movies_by_genre, [name for name in self.movies_by_genre if name.startswith(genre)]))
+        if year:
+            lists.append(self.movies_by_year.get(int(year), array("i")))
+
+        if lists:
+            predicate = (lambda p: all(check(p) for check in predicates)) if predicates else None
+            positions = intersect(lists, start, predicate, limit)
+        else:
+            positions = range(start, min(start + limit, len(self.ids)))
+        return [self.movie(position) for position in positions]
+
+    def fuzzy_search(self, filters, limit=PAGE_SIZE):
+        # closest matches when the exact search found nothing, ranked like MySQLBackend.fuzzy_search
+        title, actor, genre, year = filters
+        title_hits = actor_hits = None
+        if title:
+            title_hits = self.title_index.fuzzy(fuzzy.normalize(title))
+        if actor:
+            query = fuzzy.normalize(actor)
+            actor_hits = {}
+            for index, movies in ((self.people_index, self.movies_by_person), (self.director_index, self.movies_by_director)):
+                for code, distance in index.fuzzy(query).items():
+                    for position in movies.get(code, ()):
+                        if distance < actor_hits.get(position, distance + 1):
+                            actor_hits[position] = distance
+        hits = fuzzy.combine(title_hits, actor_hits)
+        movies = [self.movie(position) for position in hits]
+        distances = {movie["id"]: hits[self.position[movie["id"]]] for movie in movies}
+        return fuzzy.rank([m for m in movies if fuzzy.matches_filters(m, genre, year)], distances, limit)
+
+    def movie(self, position):
+        rating = self.ratings[position]
+        year = self.years[position]
+        star1, star2, star3 = (self.people[code] for code in self.cast[3 * position:3 * position + 3])
+        return {
+            "id": self.ids[position],
+            "title": self.titles[position],
+            "release_year": None if year == NONE else year,
+            "genre": self.genre_names[self.genres[position]],
+            "rating": None if rating == NONE else rating / 10,
+            "director": self.director_names[self.directors[position]],
+            "star1": star1,
+            "star2": star2,
+            "star3": star3,
+        }
+
+    def summary(self, dimension):
+        if dimension not in self.summaries:
+            self.summaries[dimension] = summarize(map(self.movie, range(len(self.ids))), dimension)
+        return self.summaries[dimension]
+
+    def analytics(self, dimension):
+        return self.summary(dimension)[0]
+
+    def top_movies(self, dimension, group_name):
+        return self.summary(dimension)[1].get(group_name, [])
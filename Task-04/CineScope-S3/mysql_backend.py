@@ -0,0 +1,175 @@
+# mysql_backend.py
+# answers dashboard searches from MySQL through prepared statements and the result cache
+import threading
+import time
+import mysql.connector
+from mysql.connector import errors
+
+import db_pool
+import fuzzy
+from analytics import GROUP_LIMIT, parse_histogram
+from query_builder import MOVIE_COLUMNS, PAGE_SIZE, StatementCache, build_query
+from search_cache import SearchCache
+
+# ping the leased connection before a search if it sat idle this long (seconds)
+HEALTH_CHECK_INTERVAL = 30
+VERSION_QUERY = "SELECT version FROM catalogue_version WHERE id = 1"
+SUMMARY_QUERY = (
+    "SELECT group_name, movie_count, mean_rating, histogram FROM analytics_summary "
+    "WHERE dimension = %s ORDER BY movie_count DESC, group_name LIMIT %s"
+)
+TOP_QUERY = (
+    "SELECT movie_id AS id, title, release_year, rating FROM analytics_top "
+    "WHERE dimension = %s AND group_name = %s ORDER BY position"
+)
+
+
+class MySQLBackend:
+    name = "mysql"
+
+    def __init__(self):
+        # one pooled connection is leased for searches; prepared statements live in its session,
+        # so it is kept instead of being returned after every query. The lock serializes users.
+        self.lock = threading.Lock()
+        self.conn = None
+        self.statements_cache = None
+        self.last_used = 0
+        self.cache = SearchCache()
+
+    def statements(self):
+        if self.conn is None:
+            self.conn = db_pool.connection()
+            self.statements_cache = StatementCache(self.conn)
+        elif time.monotonic() - self.last_used > HEALTH_CHECK_INTERVAL and not self.conn.is_connected():
+            # dropped while idle (wait_timeout): the new session has no prepared statements
+            db_pool.ensure_alive(self.conn)
+            self.statements_cache = StatementCache(self.conn)
+        self.last_used = time.monotonic()
+        return self.statements_cache
+
+    def warm_up(self):
+        # connect ahead of the first search, e.g. while the cover page is still showing
+        with self.lock:
+            self.statements()
+
+    def drop_connection(self):
+        try:
+            self.conn.close()  # back to the pool, which reconnects it before handing it out again
+        except mysql.connector.Error:
+            pass
+        self.conn = None
+
+    def catalogue_version(self, statements):
+        try:
+            rows = statements.execute(VERSION_QUERY, [])
+        except mysql.connector.Error:
+            return None  # catalogue imported before versioning existed
+        return rows[0]["version"] if rows else None
+
+    def search(self, filters, after=None, limit=PAGE_SIZE):
+        with self.lock:
+            try:
+                return self.cached_search(filters, after, limit)
+            except (errors.OperationalError, errors.InterfaceError):
+                # connection dropped mid-query, retry once on a fresh session
+                if self.conn is not None:
+                    self.drop_connection()
+                return self.cached_search(filters, after, limit)
+
+    def cached_search(self, filters, after, limit):
+        statements = self.statements()
+        self.cache.sync_version(lambda: self.catalogue_version(statements))
+        key = (filters, after, limit)
+        movies = self.cache.get(key)
+        if movies is None:
+            movies = statements.execute(*build_query(*filters, after=after, limit=limit))
+            self.cache.put(key, movies)
+        return movies
+
+    def analytics(self, dimension):
+        # precomputed by import_csv.py, see analytics.py
+        with self.lock:
+            rows = self.statements().execute(SUMMARY_QUERY, [dimension, GROUP_LIMIT])
+        for row in rows:
+            row["histogram"] = parse_histogram(row["histogram"])
+        return rows
+
+    def top_movies(self, dimension, group_name):
+        with self.lock:
+            return self.statements().execute(TOP_QUERY, [dimension, group_name])
+
+    def fuzzy_search(self, filters, limit=PAGE_SIZE):
+        # closest matches when the exact search found nothing, see fuzzy.py
+        title, actor, genre, year = filters
+        with self.lock:
+            self.statements()  # health check
+            cursor = self.conn.cursor()
+            try:
+                hits = fuzzy.combine(
+                    self.fuzzy_hits(cursor, title, (fuzzy.TITLE,)) if title else None,
+                    self.fuzzy_hits(cursor, actor, fuzzy.PEOPLE) if actor else None,
+                )
+                movies = []
+                ids = list(hits)
+                for start in range(0, len(ids), 1000):
+                    chunk = ids[start:start + 1000]
+                    cursor.execute(
+                        f"SELECT {', '.join(MOVIE_COLUMNS)} FROM movies WHERE id IN ({', '.join(['%s'] * len(chunk))})",
+                        chunk
+                    )
+                    movies.extend(dict(zip(MOVIE_COLUMNS, row)) for row in cursor.fetchall())
+            finally:
+                cursor.close()
+        movies = [movie for movie in movies if fuzzy.matches_filters(movie, genre, year)]
+        return fuzzy.rank(movies, hits, limit)
+
+    def fuzzy_hits(self, cursor, text, fields):
+        # movie id -> edit distance for one filter
+        query = fuzzy.normalize(text)
+        distance = fuzzy.max_distance(query)
+        grams = fuzzy.ngrams(query)
+        if not grams:
+            return {}
+        gram_list = sorted(grams)
+        cursor.execute(
+            f"SELECT gram, terms FROM fuzzy_gram_counts WHERE gram IN ({', '.join(['%s'] * len(gram_list))})",
+            gram_list
+        )
+        counts = dict(cursor.fetchall())
+        probes = fuzzy.probe_grams(gram_list, lambda gram: counts.get(gram, 0), distance)
+        probes = [gram for gram in probes if counts.get(gram)]
+        if not probes:
+            return {}
+        # rarest probe first, like TextIndex.fuzzy: a single IN (...) would come back in gram
+        # order and the cut could drop the match sitting in the rarest postings
+        candidates = {}
+        for gram in probes:
+            cursor.execute(
+                "SELECT t.id, t.term FROM fuzzy_grams g JOIN fuzzy_terms t ON t.id = g.term_id "
+                "WHERE g.gram = %s LIMIT %s",
+                (gram, fuzzy.MAX_CANDIDATES - len(candidates))
+            )
+            candidates.update(cursor.fetchall())
+            if len(candidates) >= fuzzy.MAX_CANDIDATES:
+                break
+        term_distances = {}
+        for term_id, term in candidates.items():
+            found = fuzzy.verify(query, grams, distance, term)
+            if found is not None:
+                term_distances[term_id] = found
+        if not term_distances:
+            return {}
+        hits = {}
+        term_ids = list(term_distances)
+        for start in range(0, len(term_ids), 1000):
+            chunk = term_ids[start:start + 1000]
+            cursor.execute(
+                f"SELECT term_id, movie_id FROM fuzzy_links WHERE term_id IN ({', '.join(['%s'] * len(chunk))}) "
+                f"AND field IN ({', '.join(['%s'] * len(fields))})",
+                chunk + list(fields)
+            )
+            for term_id, movie_id in cursor.fetchall():
+                found = term_distances[term_id]
+                if found < hits.get(movie_id, found + 1):
+                    hits[movie_id] = found
+        return hits
@@ -0,0 +1,102 @@
+# normalize.py
+# splits the comma-joined genre string and the star1..star3 columns into join tables,
+# so the dashboard can filter on indexed lookups instead of scanning movies
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS genres (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        UNIQUE KEY uq_genre_name (name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS people (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        UNIQUE KEY uq_person_name (name),
+        FULLTEXT INDEX ft_person_name (name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS movie_genre (
+        movie_id INT NOT NULL,
+        genre_id INT NOT NULL,
+        PRIMARY KEY (movie_id, genre_id),
+        INDEX idx_genre_movie (genre_id, movie_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS movie_cast (
+        movie_id INT NOT NULL,
+        person_id INT NOT NULL,
+        billing TINYINT NOT NULL,
+        PRIMARY KEY (movie_id, person_id),
+        INDEX idx_person_movie (person_id, movie_id)
+    )
+    """,
+]
+
+
+def create_tables(cursor):
+    for statement in SCHEMA:
+        cursor.execute(statement)
+
+
+def split_genres(genre):
+    return [name.strip() for name in (genre or "").split(",") if name.strip()]
+
+
+def split_cast(*stars):
+    return [(billing, name.strip()) for billing, name in enumerate(stars, 1) if name and name.strip()]
+
+
+def insert_many(cursor, table, columns, rows, batch_size, ignore=False):
+    placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        cursor.execute(
+            f"INSERT {'IGNORE ' if ignore else ''}INTO {table} ({', '.join(columns)}) "
+            f"VALUES {', '.join([placeholder] * len(batch))}",
+            [value for row in batch for value in row]
+        )
+
+
+def lookup_ids(conn, cursor, table, names, batch_size):
+    # names are unique under the column collation, so insert once and read the ids back
+    insert_many(cursor, table, ["name"], [(name,) for name in names], batch_size, ignore=True)
+    conn.commit()
+    cursor.execute(f"SELECT id, name FROM {table}")
+    ids = {name: row_id for row_id, name in cursor.fetchall()}
+    for name in names:
+        if name not in ids:
+            # the collation folded it onto another spelling (case, accents, trailing spaces)
+            cursor.execute(f"SELECT id FROM {table} WHERE name = %s", (name,))
+            ids[name] = cursor.fetchone()[0]
+    return ids
+
+
+def build(conn, cursor, batch_size=1000):
+    create_tables(cursor)
+
+    cursor.execute("SELECT id, genre, star1, star2, star3 FROM movies")
+    movies = [(movie_id, split_genres(genre), split_cast(s1, s2, s3)) for movie_id, genre, s1, s2, s3 in cursor.fetchall()]
+
+    genre_ids = lookup_ids(conn, cursor, "genres", sorted({g for _, genres, _ in movies for g in genres}), batch_size)
+    person_ids = lookup_ids(conn, cursor, "people", sorted({n for _, _, cast in movies for _, n in cast}), batch_size)
+
+    # links are cheap to rebuild and this keeps them right after REPLACE-style imports change ids
+    cursor.execute("DELETE FROM movie_genre")
+    cursor.execute("DELETE FROM movie_cast")
+    movie_genre = {(movie_id, genre_ids[g]) for movie_id, genres, _ in movies for g in genres}
+    movie_cast = {}
+    for movie_id, _, cast in movies:
+        for billing, name in cast:
+            movie_cast.setdefault((movie_id, person_ids[name]), billing)
+    insert_many(cursor, "movie_genre", ["movie_id", "genre_id"], sorted(movie_genre), batch_size)
+    insert_many(
+        cursor, "movie_cast", ["movie_id", "person_id", "billing"],
+        [key + (billing,) for key, billing in sorted(movie_cast.items())], batch_size
+    )
+    conn.commit()
+    return len(movie_genre), len(movie_cast)
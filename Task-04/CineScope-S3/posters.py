@@ -0,0 +1,183 @@
+# posters.py
+# poster thumbnails for the movie cards, loaded without ever blocking the GUI thread.
+# Images are fetched from a local directory or an HTTP server, decoded and downscaled on a
+# background pool (QImage is safe to use off the GUI thread, QPixmap is not), and the
+# thumbnails are kept in an on-disk LRU cache keyed by movie id, bounded in bytes.
+# Cards paint a placeholder until their thumbnail arrives.
+import os
+import threading
+from collections import OrderedDict
+
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, Signal
+
+THUMB_WIDTH = 76
+THUMB_HEIGHT = 114  # 2:3, the usual poster shape
+FETCH_TIMEOUT = 5
+LOADER_THREADS = 4
+# decoded pixmaps kept for painting, a few screens' worth of cards
+PIXMAP_CACHE_SIZE = 300
+CACHE_DIR = os.environ.get("CINESCOPE_POSTER_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "cinescope", "posters"))
+CACHE_MAX_BYTES = int(os.environ.get("CINESCOPE_POSTER_CACHE_MB", "64")) * 1024 * 1024
+EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def add_poster_arguments(parser):
+    parser.add_argument("--posters", default=os.environ.get("CINESCOPE_POSTERS"),
+                        help="poster directory or base URL, images named <movie id>.jpg "
+                             "(a URL may also contain an {id} placeholder)")
+
+
+def fetch_poster(source, movie_id):
+    # raw image bytes, or None if the source has no poster for this movie
+    if source.startswith(("http://", "https://")):
+        # imported on first use: main.py loads this module before the cover page paints,
+        # and urllib.request (http.client, ssl, email) is slow to import
+        import urllib.request
+        url = source.format(id=movie_id) if "{id}" in source else f"{source.rstrip('/')}/{movie_id}.jpg"
+        try:
+            with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as response:
+                return response.read()
+        except OSError:  # URLError, HTTPError and timeouts
+            return None
+    for extension in EXTENSIONS:
+        path = os.path.join(source, f"{movie_id}{extension}")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+    return None
+
+
+class ThumbnailCache:
+    # <movie id>.jpg files, the least recently used are deleted once the directory outgrows max_bytes
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # recency survives restarts through the files' modification times
+        files = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith(".jpg"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        self.entries = OrderedDict((name, size) for _, name, size in sorted(files))
+        self.bytes = sum(self.entries.values())
+        self.evict()
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def get(self, movie_id):
+        name = f"{movie_id}.jpg"
+        with self.lock:
+            if name not in self.entries:
+                return None
+            self.entries.move_to_end(name)
+        image = QImage(self.path(name))
+        if image.isNull():
+            return None
+        try:
+            os.utime(self.path(name))
+        except OSError:
+            pass
+        return image
+
+    def put(self, movie_id, image):
+        name = f"{movie_id}.jpg"
+        tmp = self.path(f".{name}.{threading.get_ident()}.tmp")
+        if not image.save(tmp, "JPG", 85):
+            return
+        os.replace(tmp, self.path(name))  # other readers never see a half-written file
+        size = os.path.getsize(self.path(name))
+        with self.lock:
+            self.bytes += size - self.entries.pop(name, 0)
+            self.entries[name] = size
+            self.evict()
+
+    def evict(self):
+        while self.bytes > self.max_bytes and self.entries:
+            name, size = self.entries.popitem(last=False)
+            self.bytes -= size
+            try:
+                os.remove(self.path(name))
+            except OSError:
+                pass
+
+
+class PosterSignals(QObject):
+    loaded = Signal(int, QImage)
+    missing = Signal(int)
+
+
+class PosterTask(QRunnable):
+    def __init__(self, source, cache, movie_id, signals):
+        super().__init__()
+        self.source = source
+        self.cache = cache
+        self.movie_id = movie_id
+        self.signals = signals
+
+    def run(self):
+        image = self.cache.get(self.movie_id)
+        if image is None:
+            data = fetch_poster(self.source, self.movie_id)
+            image = QImage.fromData(data) if data else QImage()
+            if image.isNull():
+                self.signals.missing.emit(self.movie_id)
+                return
+            image = image.scaled(THUMB_WIDTH, THUMB_HEIGHT, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+            # crop the overflow so every thumbnail is exactly THUMB_WIDTH x THUMB_HEIGHT
+            image = image.copy((image.width() - THUMB_WIDTH) // 2, (image.height() - THUMB_HEIGHT) // 2,
+                               THUMB_WIDTH, THUMB_HEIGHT)
+            self.cache.put(self.movie_id, image)
+        self.signals.loaded.emit(self.movie_id, image)
+
+
+class PosterLoader(QObject):
+    # asked by the card delegate for the posters of the cards it paints
+    updated = Signal()
+
+    def __init__(self, source, cache=None, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.cache = cache or ThumbnailCache()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(LOADER_THREADS)
+        self.signals = PosterSignals(self)
+        self.signals.loaded.connect(self.on_loaded)
+        self.signals.missing.connect(self.on_missing)
+        self.pixmaps = OrderedDict()  # movie id -> QPixmap, GUI thread only
+        self.pending = set()
+        self.missing = set()
+        self.requests = 0
+        # many thumbnails arrive together while scrolling, repaint once for all of them
+        self.repaint_timer = QTimer(self)
+        self.repaint_timer.setSingleShot(True)
+        self.repaint_timer.setInterval(16)
+        self.repaint_timer.timeout.connect(self.updated)
+
+    def pixmap(self, movie_id):
+        # the thumbnail if it is ready, otherwise starts loading it and returns None
+        pixmap = self.pixmaps.get(movie_id)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(movie_id)
+            return pixmap
+        if movie_id not in self.pending and movie_id not in self.missing:
+            self.pending.add(movie_id)
+            self.requests += 1
+            # later requests get higher priority, so the cards on screen now load before the ones scrolled past
+            self.pool.start(PosterTask(self.source, self.cache, movie_id, self.signals), self.requests)
+        return None
+
+    def on_loaded(self, movie_id, image):
+        self.pending.discard(movie_id)
+        self.pixmaps[movie_id] = QPixmap.fromImage(image)
+        while len(self.pixmaps) > PIXMAP_CACHE_SIZE:
+            self.pixmaps.popitem(last=False)
+        if not self.repaint_timer.isActive():
+            self.repaint_timer.start()
+
+    def on_missing(self, movie_id):
+        self.pending.discard(movie_id)
+        self.missing.add(movie_id)
@@ -0,0 +1,126 @@
+# query_builder.py
+# builds the dashboard's search SQL. A given set of filters always produces the same
+# statement text (user input only ever goes in as parameters), so the server can prepare
+# each shape once and reuse it for every search
+import re
+from collections import OrderedDict
+
+MOVIE_COLUMNS = ("id", "title", "release_year", "genre", "rating", "director", "star1", "star2", "star3")
+PAGE_SIZE = 60
+
+# InnoDB ignores words shorter than innodb_ft_min_token_size (3) and its default stopwords
+FULLTEXT_MIN_WORD = 3
+FULLTEXT_STOPWORDS = {
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for", "from", "how",
+    "i", "in", "is", "it", "la", "of", "on", "or", "that", "the", "this", "to", "was", "what",
+    "when", "where", "who", "will", "with", "und", "www",
+}
+
+
+# the words FULLTEXT matches as prefixes, or None if it can't answer the search.
+# memory_backend.py applies the same rule so both backends find the same movies
+def fulltext_terms(text):
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return None
+    terms = []
+    for word in words:
+        if len(word) < FULLTEXT_MIN_WORD:
+            return None  # too short for the index, LIKE still finds it
+        if word not in FULLTEXT_STOPWORDS:
+            terms.append(word)
+    return terms or None
+
+
+# turn user text into a BOOLEAN MODE search, or None if FULLTEXT can't answer it
+def fulltext_query(text):
+    terms = fulltext_terms(text)
+    return " ".join(f"+{term}*" for term in terms) if terms else None
+
+
+# indexed MATCH ... AGAINST when possible, otherwise a LIKE scan over the same columns
+def text_condition(columns, text, params):
+    query = fulltext_query(text)
+    if query:
+        params.append(query)
+        return f"MATCH({', '.join(columns)}) AGAINST (%s IN BOOLEAN MODE)"
+    params.extend([f"%{text}%"] * len(columns))
+    return "(" + " OR ".join(f"{column} LIKE %s" for column in columns) + ")"
+
+
+# keyset pagination: each page continues after the (rating, id) of the last row shown,
+# so deep pages cost the same as the first one instead of growing like OFFSET
+def build_query(title, actor, genre, year, after=None, limit=PAGE_SIZE):
+    base_query = f"SELECT {', '.join(MOVIE_COLUMNS)} FROM movies"
+    conditions = []
+    params = []
+
+    # Collect conditions from all inputs
+    if title:
+        conditions.append(text_condition(["title"], title, params))
+
+    if actor:
+        # people and movie_cast come from normalize.py, one indexed name instead of three star columns
+        name_condition = text_condition(["p.name"], actor, params)
+        conditions.append(
+            "id IN (SELECT mc.movie_id FROM movie_cast mc JOIN people p ON p.id = mc.person_id "
+            f"WHERE {name_condition})"
+        )
+
+    if genre:
+        # prefix match on the unique genre name is an index range, not a substring scan
+        conditions.append(
+            "id IN (SELECT mg.movie_id FROM movie_genre mg JOIN genres g ON g.id = mg.genre_id "
+            "WHERE g.name LIKE %s)"
+        )
+        params.append(f"{genre}%")
+
+    if year.isdigit():
+        conditions.append("release_year = %s")
+        params.append(int(year))
+
+    if after is not None:
+        rating, movie_id = after
+        if rating is None:
+            conditions.append("(rating IS NULL AND id < %s)")
+            params.append(movie_id)
+        else:
+            # NULL ratings sort last in DESC order
+            conditions.append("(rating < %s OR (rating = %s AND id < %s) OR rating IS NULL)")
+            params.extend([rating, rating, movie_id])
+
+    if conditions:
+        base_query += " WHERE " + " AND ".join(conditions)
+    base_query += " ORDER BY rating DESC, id DESC LIMIT %s"
+    params.append(limit)
+    return base_query, params
+
+
+class StatementCache:
+    # one server-side prepared statement per query shape, least recently used ones are closed
+    def __init__(self, conn, size=32):
+        self.conn = conn
+        self.size = size
+        self.cursors = OrderedDict()
+
+    def execute(self, sql, params):
+        entry = self.cursors.pop(sql, None)
+        if entry is None:
+            entry = (sql, self.conn.cursor(prepared=True))
+        self.cursors[sql] = entry
+        if len(self.cursors) > self.size:
+            _, (_, oldest) = self.cursors.popitem(last=False)
+            oldest.close()
+
+        # mysql-connector only skips re-preparing when it is handed the very same string object
+        # it prepared (an identity check), and build_query makes a new one every call, so the
+        # text kept with the cursor is what gets executed
+        text, cursor = entry
+        cursor.execute(text, params)
+        columns = cursor.column_names
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def close(self):
+        for _, cursor in self.cursors.values():
+            cursor.close()
+        self.cursors.clear()
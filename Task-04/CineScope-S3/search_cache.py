@@ -0,0 +1,90 @@
+# search_cache.py
+# in-process LRU of search results, so backspacing and retyping doesn't hit MySQL again.
+# Entries expire after a TTL, the whole cache is bounded by an estimated size in bytes,
+# and everything is dropped when import_csv.py bumps the catalogue version
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_filters(title, actor, genre, year):
+    # the columns use case-insensitive collations, so "Godfather " and "godfather" are the same search
+    def clean(text):
+        return " ".join(text.lower().split())
+    year = year.strip()
+    return clean(title), clean(actor), clean(genre), year if year.isdigit() else ""
+
+
+def estimate_size(rows):
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values())
+    return size
+
+
+class SearchCache:
+    def __init__(self, max_bytes=32 * 1024 * 1024, ttl=300, version_check_interval=5):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self.entries = OrderedDict()  # key -> (stored_at, size, rows)
+        self.bytes = 0
+        self.version = None
+        self.version_checked_at = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def sync_version(self, fetch_version):
+        # fetch_version is a round trip, so it only runs every few seconds
+        now = time.monotonic()
+        if now - self.version_checked_at < self.version_check_interval:
+            return
+        self.version_checked_at = now
+        version = fetch_version()
+        with self.lock:
+            if version != self.version:
+                self.entries.clear()
+                self.bytes = 0
+                self.version = version
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, rows):
+        size = estimate_size(rows)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = (time.monotonic(), size, rows)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.bytes -= size
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+            }
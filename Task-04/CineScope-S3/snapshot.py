@@ -0,0 +1,246 @@
+# snapshot.py
+# binary columnar copy of movies.csv that opens in milliseconds.
+# Numbers are stored as fixed-width little-endian columns, repeated strings (genre, director,
+# cast) as int32 codes into a dictionary, titles as an offsets array plus one UTF-8 blob.
+# Opening a snapshot only maps the file: every column is a zero-copy view into the mapping
+# (a NumPy array when numpy is installed, a memoryview otherwise), so nothing is parsed up front.
+#
+#   python snapshot.py movies.csv movies.snap
+#
+# Rows are stored in the memory backend's order, (rating DESC, id DESC).
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+try:
+    import numpy
+except ImportError:  # optional, memoryviews are used instead
+    numpy = None
+
+MAGIC = b"CINESNAP"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+NONE = -1  # missing rating or year
+HASH_SIZE = 16  # md5 digest of the raw CSV fields, the importer's content_hash
+PREAMBLE = struct.Struct("<8sII")  # magic, format version, header length
+
+
+def is_snapshot(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def row_digest(fields):
+    # same value as import_csv.row_hash, as raw bytes
+    return hashlib.md5("\x1f".join(fields).encode("utf-8")).digest()
+
+
+def read_csv_columns(csv_path, hashes=False):
+    # (rating tenths, id, title, year, genre, director, cast, digest) tuples in (rating, id) DESC order
+    rows = []
+    with open(csv_path, "r", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for movie_id, row in enumerate(reader, 1):
+            title, year, genre, rating, director, star1, star2, star3 = row[:8]
+            rows.append((
+                round(float(rating) * 10) if rating else NONE,
+                movie_id, title,
+                int(year) if year.isdigit() else NONE,
+                genre, director, (star1, star2, star3),
+                row_digest(row[:8]) if hashes else None
+            ))
+    rows.sort(key=lambda r: (r[0], r[1]), reverse=True)
+    return rows
+
+
+def encode(values):
+    # dictionary-encode repeated strings: a list of distinct values plus one int code per row
+    names, codes, lookup = [], array("i"), {}
+    for value in values:
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(names)
+            names.append(value)
+        codes.append(code)
+    return names, codes
+
+
+class Writer:
+    # collects column blobs and their header entries, then writes the file in one go
+    def __init__(self):
+        self.columns = {}
+        self.blobs = []
+        self.size = 0
+
+    def add_blob(self, data):
+        padding = -self.size % ALIGNMENT
+        self.blobs.append(b"\0" * padding + data)
+        self.size += padding
+        offset = self.size
+        self.size += len(data)
+        return offset  # relative to the end of the header
+
+    def add_array(self, values):
+        if sys.byteorder == "big":
+            values = array(values.typecode, values)
+            values.byteswap()
+        return {"typecode": values.typecode, "count": len(values), "offset": self.add_blob(values.tobytes())}
+
+    def add_strings(self, values):
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = array("q", [0])
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        return {"offsets": self.add_array(offsets), "blob": self.add_blob(b"".join(encoded))}
+
+    def numeric(self, name, values):
+        self.columns[name] = {"kind": "numeric", **self.add_array(values)}
+
+    def text(self, name, values):
+        self.columns[name] = {"kind": "text", **self.add_strings(values)}
+
+    def dictionary(self, name, values):
+        names, codes = encode(values)
+        self.columns[name] = {"kind": "dictionary", "codes": self.add_array(codes), "values": self.add_strings(names)}
+
+    def fixed(self, name, values, width):
+        self.columns[name] = {"kind": "fixed", "width": width, "count": len(values), "offset": self.add_blob(b"".join(values))}
+
+    def save(self, path, rows):
+        header = json.dumps({"rows": rows, "columns": self.columns}).encode("utf-8")
+        data_start = PREAMBLE.size + len(header)
+        data_start += -data_start % ALIGNMENT
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+            f.write(header)
+            f.write(b"\0" * (data_start - PREAMBLE.size - len(header)))
+            for blob in self.blobs:
+                f.write(blob)
+        os.replace(tmp, path)  # readers never see a half-written snapshot
+
+
+def export_csv(csv_path, snapshot_path):
+    rows = read_csv_columns(csv_path, hashes=True)
+    writer = Writer()
+    writer.numeric("ratings", array("h", (r[0] for r in rows)))  # tenths, like DECIMAL(3, 1)
+    writer.numeric("ids", array("i", (r[1] for r in rows)))
+    writer.text("titles", [r[2] for r in rows])
+    writer.numeric("years", array("h", (r[3] for r in rows)))
+    writer.dictionary("genres", (r[4] for r in rows))
+    writer.dictionary("directors", (r[5] for r in rows))
+    writer.dictionary("cast", (name for r in rows for name in r[6]))  # three codes per row
+    writer.fixed("content_hashes", [r[7] for r in rows], HASH_SIZE)
+    writer.save(snapshot_path, len(rows))
+    return len(rows)
+
+
+class Strings:
+    # read-only sequence of strings decoded on access from an offsets array and a UTF-8 blob
+    def __init__(self, buffer, offsets, blob):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        start = self.blob + int(self.offsets[i])
+        return str(self.buffer[start:self.blob + int(self.offsets[i + 1])], "utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class Snapshot:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_size = PREAMBLE.unpack_from(self.map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} CineScope snapshot")
+        header = json.loads(self.map[PREAMBLE.size:PREAMBLE.size + header_size])
+        self.rows = header["rows"]
+        self.columns = header["columns"]
+        self.data_start = PREAMBLE.size + header_size
+        self.data_start += -self.data_start % ALIGNMENT
+        self.buffer = memoryview(self.map)
+
+    def view(self, spec, as_numpy):
+        typecode, count = spec["typecode"], spec["count"]
+        start = self.data_start + spec["offset"]
+        if as_numpy and numpy is not None:
+            return numpy.frombuffer(self.map, dtype=numpy.dtype(typecode).newbyteorder("<"), count=count, offset=start)
+        if sys.byteorder == "big":
+            raise ValueError("snapshots are little-endian, install numpy to read them on this machine")
+        return self.buffer[start:start + count * array(typecode).itemsize].cast(typecode)
+
+    def strings(self, spec):
+        return Strings(self.buffer, self.view(spec["offsets"], False), self.data_start + spec["blob"])
+
+    def numeric(self, name, as_numpy=True):
+        # as_numpy=False gives a memoryview, whose items are plain ints (faster in python loops)
+        return self.view(self.columns[name], as_numpy)
+
+    def text(self, name):
+        return self.strings(self.columns[name])
+
+    def dictionary(self, name, as_numpy=True):
+        # (distinct values, one code per row)
+        spec = self.columns[name]
+        return self.strings(spec["values"]), self.view(spec["codes"], as_numpy)
+
+    def fixed(self, name, i):
+        spec = self.columns[name]
+        start = self.data_start + spec["offset"] + i * spec["width"]
+        return bytes(self.buffer[start:start + spec["width"]])
+
+
+def read_rows(path):
+    # the importer's row tuples (see import_csv.parse_row), in the original CSV order
+    snapshot = Snapshot(path)
+    ids = snapshot.numeric("ids")
+    ratings = snapshot.numeric("ratings", as_numpy=False)
+    years = snapshot.numeric("years", as_numpy=False)
+    titles = snapshot.text("titles")
+    genre_names, genres = snapshot.dictionary("genres", as_numpy=False)
+    director_names, directors = snapshot.dictionary("directors", as_numpy=False)
+    people, cast = snapshot.dictionary("cast", as_numpy=False)
+    if numpy is not None:
+        order = numpy.argsort(ids, kind="stable").tolist()
+    else:
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+    for position in order:
+        rating, year = ratings[position], years[position]
+        yield (
+            titles[position],
+            None if year == NONE else year,
+            genre_names[genres[position]],
+            None if rating == NONE else rating / 10,
+            director_names[directors[position]],
+            *(people[code] for code in cast[3 * position:3 * position + 3]),
+            snapshot.fixed("content_hashes", position).hex(),
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write movies.csv as a CineScope columnar snapshot")
+    parser.add_argument("csv", nargs="?", default="movies.csv")
+    parser.add_argument("snapshot", nargs="?", default="movies.snap")
+    args = parser.parse_args()
+    count = export_csv(args.csv, args.snapshot)
+    print(f"{count} movies written to {args.snapshot} ({os.path.getsize(args.snapshot) // 1024} KB)")
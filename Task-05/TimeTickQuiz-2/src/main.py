@@ -3,7 +3,7 @@ from user_profile import UserProfile
 from quiz_engine import QuizEngine
 from rich.console import Console
 from rich.prompt import Prompt, IntPrompt
-from utils import get_categories
+from utils import get_categories, get_history, get_leaderboard
 
 console = Console()
 
@@ -19,7 +19,8 @@ def main():
 
     # Get quiz settings
     num_questions = IntPrompt.ask("How many questions? (1-20)", default=5)
-    difficulty = Prompt.ask("Choose difficulty", choices=["easy", "medium", "hard"], default="medium")
+    # the default follows the profile's adapted difficulty
+    difficulty = Prompt.ask("Choose difficulty", choices=["easy", "medium", "hard"], default=user.difficulty)
     time_limit = IntPrompt.ask("Time limit per question (seconds)", default=10)
 
     # Show categories
@@ -39,6 +40,19 @@ def main():
     quiz.run()
     # Save updated profile
     user.save_profile()
+    show_results(user)
+
+
+def show_results(user):
+    """Print the player's recent sessions and the leaderboard"""
+    history = get_history(user.username, 5)
+    if history:
+        console.print("\n[bold magenta]Your recent quizzes:[/bold magenta]")
+        for session in history:
+            console.print(f"{session['correct']}/{session['questions']} correct ({session['difficulty']})")
+    console.print(f"\n[bold magenta]Leaderboard[/bold magenta] (next quiz suggested: {user.difficulty})")
+    for rank, profile in enumerate(get_leaderboard(5), 1):
+        console.print(f"{rank}. [cyan]{profile['username']}[/cyan] {profile.get('high_score', 0)}")
 
 
 if __name__ == "__main__":
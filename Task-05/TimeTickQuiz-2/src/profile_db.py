@@ -0,0 +1,150 @@
+# sqlite profile storage with per-session score history
+import os
+import sqlite3
+import sys
+import time
+
+from profile_store import ProfileStore
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS profiles (
+        username TEXT PRIMARY KEY,
+        score INTEGER NOT NULL DEFAULT 0,
+        high_score INTEGER NOT NULL DEFAULT 0,
+        difficulty TEXT NOT NULL DEFAULT 'easy'
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS profiles_high_score ON profiles (high_score DESC, username)",
+    "CREATE INDEX IF NOT EXISTS profiles_difficulty ON profiles (difficulty, high_score DESC, username)",
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY,
+        username TEXT NOT NULL,
+        played_at REAL NOT NULL,
+        correct INTEGER NOT NULL,
+        questions INTEGER NOT NULL,
+        difficulty TEXT NOT NULL,
+        category INTEGER
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS sessions_username ON sessions (username, id DESC)",
+]
+PROFILE_COLUMNS = ("username", "score", "high_score", "difficulty")
+SESSION_COLUMNS = ("played_at", "correct", "questions", "difficulty", "category")
+
+
+class SQLiteProfileStore:
+    """Profiles and their session history in one SQLite database.
+
+    Same interface as ProfileStore, plus the queries a single JSON file cannot answer
+    without reading every profile: leaderboards and per-player history, each served
+    by an index. WAL mode lets readers carry on while a score is being written.
+    """
+
+    keeps_history = True
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)  # other quiz terminals may hold the write lock
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # in WAL mode NORMAL only risks the last commits on power loss, never corruption
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+
+    def get(self, username):
+        """Profile dict for username, or None"""
+        row = self.conn.execute(
+            "SELECT username, score, high_score, difficulty FROM profiles WHERE username = ?",
+            (username,)).fetchone()
+        return dict(zip(PROFILE_COLUMNS, row)) if row else None
+
+    def all(self):
+        """Every profile, by username"""
+        rows = self.conn.execute("SELECT username, score, high_score, difficulty FROM profiles ORDER BY username")
+        return [dict(zip(PROFILE_COLUMNS, row)) for row in rows]
+
+    def update(self, profile):
+        """Insert or replace one profile"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO profiles (username, score, high_score, difficulty) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (username) DO UPDATE SET score = excluded.score, "
+                "high_score = excluded.high_score, difficulty = excluded.difficulty",
+                self.row(profile))
+
+    def replace_all(self, profiles):
+        """Replace every profile at once (utils.save_profiles)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM profiles")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO profiles (username, score, high_score, difficulty) VALUES (?, ?, ?, ?)",
+                (self.row(profile) for profile in profiles))
+
+    def row(self, profile):
+        return (profile.get("username"), profile.get("score", 0),
+                profile.get("high_score", 0), profile.get("difficulty", "easy"))
+
+    def compact(self):
+        """Fold the write-ahead log back into the database file"""
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        self.conn.close()
+
+    def record_session(self, username, correct, questions, difficulty, category=None):
+        """Add one finished quiz to the player's history"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO sessions (username, played_at, correct, questions, difficulty, category) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (username, time.time(), correct, questions, difficulty, category))
+
+    def leaderboard(self, limit=10, difficulty=None):
+        """Top profiles by high score, optionally only those at one difficulty"""
+        if difficulty:
+            rows = self.conn.execute(
+                "SELECT username, score, high_score, difficulty FROM profiles WHERE difficulty = ? "
+                "ORDER BY high_score DESC, username LIMIT ?", (difficulty, limit))
+        else:
+            rows = self.conn.execute(
+                "SELECT username, score, high_score, difficulty FROM profiles "
+                "ORDER BY high_score DESC, username LIMIT ?", (limit,))
+        return [dict(zip(PROFILE_COLUMNS, row)) for row in rows]
+
+    def history(self, username, limit=10):
+        """The player's most recent sessions, newest first"""
+        rows = self.conn.execute(
+            "SELECT played_at, correct, questions, difficulty, category FROM sessions "
+            "WHERE username = ? ORDER BY id DESC LIMIT ?", (username, limit))
+        return [dict(zip(SESSION_COLUMNS, row)) for row in rows]
+
+    def recent_accuracy(self, username, sessions=5):
+        """Share of questions answered correctly over the last few sessions, or None"""
+        row = self.conn.execute(
+            "SELECT SUM(correct), SUM(questions) FROM "
+            "(SELECT correct, questions FROM sessions WHERE username = ? ORDER BY id DESC LIMIT ?)",
+            (username, sessions)).fetchone()
+        return row[0] / row[1] if row[1] else None
+
+
+def migrate_json(json_path, db_path):
+    """One-shot copy of profiles.json (and any pending journal) into a new database"""
+    store = SQLiteProfileStore(db_path)
+    if store.conn.execute("SELECT 1 FROM profiles LIMIT 1").fetchone():
+        return store, 0  # already migrated
+    profiles = ProfileStore(json_path).all() if os.path.exists(json_path) else []
+    store.replace_all(profiles)
+    return store, len(profiles)
+
+
+if __name__ == "__main__":
+    # python profile_db.py [profiles.json] [profiles.db]
+    here = os.path.dirname(__file__)
+    json_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(here, '../profiles.json')
+    db_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(here, '../profiles.db')
+    _, count = migrate_json(json_path, db_path)
+    print(f"{count} profiles migrated to {db_path}")
@@ -0,0 +1,210 @@
+# indexed profile storage behind utils.get_profile and utils.update_profile
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+    import msvcrt
+
+# fold the journal back into the snapshot after this many updates, counted across all processes
+COMPACT_EVERY = 500
+# updates made within this many seconds are written together, only the latest per player
+FLUSH_INTERVAL = 1.0
+
+
+class FileLock:
+    """Exclusive lock shared by every process using the same profiles.json"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, 'a+')
+        if fcntl:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.file.close()
+        self.file = None
+
+
+class ProfileStore:
+    """Profiles kept in memory by username, with updates appended to a journal.
+
+    profiles.json stays the snapshot (same list-of-profiles format as before), and every
+    update is one JSON line appended to profiles.json.journal instead of a full rewrite.
+    Any number of processes can share the files: appends and compaction happen under
+    profiles.json.lock, and each process reads the lines the others appended before it
+    answers a lookup. Compaction rewrites the snapshot atomically and starts a new journal.
+
+    Only the latest score of each player is kept, so there is no session history
+    (keeps_history is False, see utils.record_session); that needs the SQLite store.
+    """
+
+    keeps_history = False
+
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.file_lock = FileLock(path + ".lock")
+        self.lock = threading.RLock()
+        self.profiles = {}
+        self.pending = {}  # username -> profile not yet in the journal
+        self.flush_timer = None
+        self.snapshot_id = None
+        self.journal_offset = 0
+        self.journal_entries = 0
+        with self.lock, self.file_lock:
+            self._refresh()
+
+    def _refresh(self):
+        # catch up with the files, called with the file lock held
+        try:
+            stat = os.stat(self.path)
+            snapshot_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            snapshot_id = None
+        try:
+            journal_size = os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            journal_size = 0
+        if snapshot_id != self.snapshot_id or journal_size < self.journal_offset:
+            # first load, or another process compacted since
+            self.profiles = {}
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for profile in json.load(f):
+                        self.profiles[profile.get("username")] = profile
+            except (json.JSONDecodeError, FileNotFoundError):
+                pass
+            self.snapshot_id = snapshot_id
+            self.journal_offset = 0
+            self.journal_entries = 0
+        if journal_size == self.journal_offset:
+            return
+        with open(self.journal_path, 'rb') as f:
+            f.seek(self.journal_offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                profile = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self.profiles[profile.get("username")] = profile
+            self.journal_entries += 1
+        self.journal_offset += end
+        if end < len(data):
+            # a write cut short by a crash, nobody else can be mid-write while we hold the lock.
+            # New entries must not be appended after the partial line
+            self._compact()
+
+    def _flush(self):
+        # append the pending profiles in one write, called with the file lock held
+        lines = "".join(json.dumps(profile) + "\n" for profile in self.pending.values())
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending = {}
+        self._refresh()
+        if self.journal_entries >= COMPACT_EVERY:
+            self._compact()
+
+    def _compact(self):
+        # write all profiles to the snapshot atomically and empty the journal, called with the file lock held
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(list(self.profiles.values()), f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        # readers see either the old or the new snapshot, never a half-written one.
+        # A crash before the journal is emptied only replays entries already in the snapshot
+        os.replace(tmp, self.path)
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(directory, os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        with open(self.journal_path, 'w', encoding='utf-8'):
+            pass
+        stat = os.stat(self.path)
+        self.snapshot_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self.journal_offset = 0
+        self.journal_entries = 0
+
+    def get(self, username):
+        """Profile dict for username, or None"""
+        with self.lock:
+            profile = self.pending.get(username)
+            if profile is None:
+                with self.file_lock:
+                    self._refresh()
+                profile = self.profiles.get(username)
+            return dict(profile) if profile is not None else None
+
+    def all(self):
+        """Every profile, in the order they were first saved"""
+        with self.lock:
+            with self.file_lock:
+                self._refresh()
+            return [dict(profile) for profile in {**self.profiles, **self.pending}.values()]
+
+    def update(self, profile):
+        """Store one profile, it reaches the journal within FLUSH_INTERVAL seconds"""
+        with self.lock:
+            self.pending[profile.get("username")] = dict(profile)
+            if self.flush_timer is None:
+                self.flush_timer = threading.Timer(FLUSH_INTERVAL, self.flush)
+                self.flush_timer.daemon = True
+                self.flush_timer.start()
+
+    def flush(self):
+        """Write pending updates to the journal now"""
+        with self.lock:
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            if self.pending:
+                with self.file_lock:
+                    self._flush()
+
+    def close(self):
+        self.flush()
+
+    def leaderboard(self, limit=10, difficulty=None):
+        """Top profiles by high score, optionally only those at one difficulty"""
+        profiles = [p for p in self.all() if not difficulty or p.get("difficulty") == difficulty]
+        profiles.sort(key=lambda p: (-p.get("high_score", 0), p.get("username")))
+        return profiles[:limit]
+
+    def replace_all(self, profiles):
+        """Replace every profile at once (utils.save_profiles)"""
+        with self.lock, self.file_lock:
+            self.profiles = {profile.get("username"): dict(profile) for profile in profiles}
+            self.pending = {}
+            self._compact()
+
+    def compact(self):
+        """Fold the journal into profiles.json now"""
+        with self.lock:
+            self.flush()
+            with self.file_lock:
+                self._refresh()
+                self._compact()
@@ -0,0 +1,189 @@
+# local question bank so a quiz starts without waiting on opentdb
+import json
+import os
+import sqlite3
+import threading
+import time
+import requests
+
+QUESTION_URL = "https://opentdb.com/api.php"
+TOKEN_URL = "https://opentdb.com/api_token.php"
+BANK_FILE = os.path.join(os.path.dirname(__file__), '../questions.db')
+FETCH_TIMEOUT = 5
+# questions kept ready per (category, difficulty)
+BUCKET_SIZE = 50
+# opentdb returns at most 50 questions per call and one call per ip every 5 seconds
+MAX_AMOUNT = 50
+REQUEST_INTERVAL = 5
+# most opentdb calls one refill makes, so a refused or rate-limited refill gives up
+REFILL_CALLS = 10
+
+# opentdb response codes
+SUCCESS, NO_RESULTS, INVALID_PARAMETER, TOKEN_NOT_FOUND, TOKEN_EMPTY, RATE_LIMIT = range(6)
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS questions (
+        id INTEGER PRIMARY KEY,
+        category INTEGER NOT NULL,
+        difficulty TEXT NOT NULL,
+        question TEXT NOT NULL,
+        data TEXT NOT NULL,
+        UNIQUE (category, difficulty, question)
+    )
+    """,
+]
+
+
+class QuestionBank:
+    """Questions fetched ahead of time and stored in questions.db.
+
+    A quiz takes its questions from the bucket for its category and difficulty, and a
+    background thread tops the bucket back up to BUCKET_SIZE afterwards. Only when a
+    bucket runs dry does the quiz wait on OpenTDB. Served questions leave the bank, and
+    none is served twice in one session.
+    """
+
+    def __init__(self, path=BANK_FILE):
+        self.path = path
+        self.local = threading.local()  # one sqlite connection per thread
+        self.lock = threading.Lock()  # served and refilling
+        self.request_lock = threading.Lock()  # token and last_request
+        self.token = None
+        self.last_request = 0
+        self.served = set()
+        self.refilling = set()
+        conn = self.conn()
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def count(self, category, difficulty):
+        return self.conn().execute(
+            "SELECT COUNT(*) FROM questions WHERE category = ? AND difficulty = ?",
+            (category, difficulty)).fetchone()[0]
+
+    def take(self, category, difficulty, amount):
+        """Up to amount stored questions, removed from the bank"""
+        conn = self.conn()
+        with conn:
+            rows = conn.execute(
+                "SELECT id, question, data FROM questions WHERE category = ? AND difficulty = ? ORDER BY RANDOM()",
+                (category, difficulty)).fetchall()
+            taken = []
+            with self.lock:
+                for row_id, question, data in rows:
+                    if len(taken) == amount:
+                        break
+                    if question in self.served:
+                        continue
+                    self.served.add(question)
+                    taken.append((row_id, json.loads(data)))
+            conn.executemany("DELETE FROM questions WHERE id = ?", ((row_id,) for row_id, _ in taken))
+        return [data for _, data in taken]
+
+    def store(self, category, difficulty, questions):
+        with self.conn() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO questions (category, difficulty, question, data) VALUES (?, ?, ?, ?)",
+                ((category, difficulty, q["question"], json.dumps(q)) for q in questions))
+
+    def request_token(self):
+        # a session token makes opentdb skip questions it already sent us
+        try:
+            response = requests.get(TOKEN_URL, params={"command": "request"}, timeout=FETCH_TIMEOUT)
+            response.raise_for_status()
+            return response.json().get("token")
+        except (requests.RequestException, ValueError):
+            return None
+
+    def fetch(self, category, difficulty, amount):
+        """(response code, questions) from OpenTDB, the code is None if the request failed"""
+        with self.request_lock:
+            # calls are spaced out here rather than letting opentdb refuse them
+            wait = self.last_request + REQUEST_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            if self.token is None:
+                self.token = self.request_token()
+            params = {
+                "amount": min(amount, MAX_AMOUNT),
+                "difficulty": difficulty,
+                "type": "multiple",
+                "category": category
+            }
+            if self.token:
+                params["token"] = self.token
+            try:
+                response = requests.get(QUESTION_URL, params=params, timeout=FETCH_TIMEOUT)
+                data = response.json()
+            except (requests.RequestException, ValueError):
+                return None, []
+            finally:
+                self.last_request = time.monotonic()
+            code = data.get("response_code")
+            if code in (TOKEN_NOT_FOUND, TOKEN_EMPTY):
+                self.token = None  # expired, or every question was already sent: start over
+        return code, (data.get("results", []) if code == SUCCESS else [])
+
+    def questions(self, category, difficulty, amount):
+        """amount questions, from the bank if it has them, otherwise from OpenTDB"""
+        questions = self.take(category, difficulty, amount)
+        if len(questions) < amount:
+            code, fetched = self.fetch(category, difficulty, max(amount - len(questions), BUCKET_SIZE))
+            if code == NO_RESULTS:
+                # fewer questions exist than a full bucket, ask for just what is missing
+                code, fetched = self.fetch(category, difficulty, amount - len(questions))
+            self.store(category, difficulty, fetched)
+            questions += self.take(category, difficulty, amount - len(questions))
+        self.refill(category, difficulty)
+        return questions
+
+    def refill(self, category, difficulty):
+        """Top the bucket back up to BUCKET_SIZE on a background thread"""
+        key = (category, difficulty)
+        with self.lock:
+            if key in self.refilling:
+                return
+            self.refilling.add(key)
+        threading.Thread(target=self.run_refill, args=key, daemon=True).start()
+
+    def run_refill(self, category, difficulty):
+        try:
+            missing = BUCKET_SIZE - self.count(category, difficulty)
+            amount = missing
+            for _ in range(REFILL_CALLS):
+                if missing <= 0 or amount <= 0:
+                    break
+                code, fetched = self.fetch(category, difficulty, min(amount, missing))
+                if code == NO_RESULTS:
+                    amount //= 2  # the category has fewer questions left than asked for
+                    continue
+                if code not in (SUCCESS, TOKEN_NOT_FOUND, TOKEN_EMPTY, RATE_LIMIT):
+                    break  # offline, or a category opentdb does not know
+                self.store(category, difficulty, fetched)
+                left = BUCKET_SIZE - self.count(category, difficulty)
+                if code == SUCCESS and left == missing:
+                    break  # nothing new came back
+                missing = left
+        finally:
+            with self.lock:
+                self.refilling.discard((category, difficulty))
+
+
+_bank = None
+
+
+def get_bank():
+    """The shared question bank, opened on first use"""
+    global _bank
+    if _bank is None:
+        _bank = QuestionBank()
+    return _bank
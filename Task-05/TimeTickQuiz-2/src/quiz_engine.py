@@ -1,14 +1,14 @@
 # handles quiz logic and api calls
-import requests
 import html
 import threading
 import time
 from rich.console import Console
 from rich.prompt import Prompt
+from question_bank import get_bank
+from utils import record_session
 
 console = Console()
 CATEGORY_URL = "https://opentdb.com/api_category.php"
-QUESTION_URL = "https://opentdb.com/api.php"
 
 class QuizEngine:
     def __init__(self, profile, num_questions, difficulty, time_limit, category_id):
@@ -21,25 +21,12 @@ class QuizEngine:
         self.score = profile.score
 
     def fetch_questions(self):
-        """Fetch quiz questions from OpenTDB API"""
-        params = {
-            "amount": self.num_questions,
-            "difficulty": self.difficulty.lower(),
-            "type": "multiple",
-            "category": self.category_id
-        }
-
-        try:
-            response = requests.get(QUESTION_URL, params=params)
-            data = response.json()
-            if data["response_code"] != 0:
-                console.print("[red]No questions found. Try different settings.[/red]")
-                return False
-            self.questions = data["results"]
-            return True
-        except requests.RequestException as e:
-            console.print(f"[red]Error fetching questions: {e}[/red]")
+        """Get quiz questions from the local question bank, which falls back to OpenTDB"""
+        self.questions = get_bank().questions(self.category_id, self.difficulty.lower(), self.num_questions)
+        if not self.questions:
+            console.print("[red]No questions found. Check your connection or try different settings.[/red]")
             return False
+        return True
 
     def ask_question(self, question_data):
         """Display a question, enforce time limit, and return True/False based on answer"""
@@ -87,10 +74,16 @@ class QuizEngine:
         if not self.fetch_questions():
             return
 
+        start_score = self.score
         for idx, q in enumerate(self.questions, 1):
-            console.print(f"\n[bold cyan]Question {idx}/{self.num_questions}[/bold cyan]")
+            console.print(f"\n[bold cyan]Question {idx}/{len(self.questions)}[/bold cyan]")
             if self.ask_question(q):
                 self.score += 1
 
         self.profile.score = self.score
-        console.print(f"\n[bold magenta]Final Score: {self.score}/{self.num_questions}[/bold magenta]")
+        # the leaderboard ranks by high score, so it must follow the best quiz
+        self.profile.high_score = max(self.profile.high_score, self.score)
+        record_session(self.profile.username, self.score - start_score, len(self.questions),
+                       self.difficulty, self.category_id)
+        self.profile.adapt_difficulty()
+        console.print(f"\n[bold magenta]Final Score: {self.score}/{len(self.questions)}[/bold magenta]")
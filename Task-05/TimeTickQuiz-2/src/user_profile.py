@@ -1,4 +1,8 @@
-from utils import get_profile, update_profile
+from utils import get_profile, get_recent_accuracy, update_profile
+
+# recent share of correct answers needed to move up to each difficulty
+HARD_ACCURACY = 0.8
+MEDIUM_ACCURACY = 0.5
 
 class UserProfile:
     def __init__(self, username):
@@ -24,6 +28,16 @@ class UserProfile:
         self.save()
 
     def adapt_difficulty(self):
+        # with a session history (SQLite store) the last few quizzes decide, one indexed read
+        accuracy = get_recent_accuracy(self.username)
+        if accuracy is not None:
+            if accuracy >= HARD_ACCURACY:
+                self.difficulty = "hard"
+            elif accuracy >= MEDIUM_ACCURACY:
+                self.difficulty = "medium"
+            else:
+                self.difficulty = "easy"
+            return
         if self.score >= 50:
             self.difficulty = "hard"
         elif self.score >= 20:
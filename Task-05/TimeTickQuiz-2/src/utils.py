@@ -1,60 +1,135 @@
 # utility functions for quiz
+import atexit
 import json
 import os
+import threading
+import time
 import requests
+from profile_db import migrate_json
+from profile_store import ProfileStore
 
 PROFILE_FILE = os.path.join(os.path.dirname(__file__), '../profiles.json')
+# path of an SQLite profile database; when set it replaces profiles.json,
+# which is migrated into it the first time
+PROFILE_DB = os.environ.get("TIMETICKQUIZ_PROFILE_DB")
 CATEGORY_URL = "https://opentdb.com/api_category.php"
+CATEGORY_CACHE_FILE = os.path.join(os.path.dirname(__file__), '../categories.json')
+# the category list rarely changes, a day-old copy is refreshed in the background
+CATEGORY_TTL = 24 * 60 * 60
+
+
+_store = None
+_category_refresh = None
+
+
+def get_store():
+    """The shared profile store, loaded on first use"""
+    global _store
+    if _store is None:
+        if PROFILE_DB:
+            _store, _ = migrate_json(PROFILE_FILE, PROFILE_DB)
+        else:
+            _store = ProfileStore(PROFILE_FILE)
+        # write out updates still waiting to be coalesced
+        atexit.register(_store.close)
+    return _store
 
 
 def load_profiles():
     """Load profiles from profiles.json"""
-    if not os.path.exists(PROFILE_FILE):
-        return []
-    try:
-        with open(PROFILE_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+    return get_store().all()
 
 
 def save_profiles(profiles):
     """Save profiles to profiles.json"""
-    os.makedirs(os.path.dirname(PROFILE_FILE), exist_ok=True)
-    with open(PROFILE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(profiles, f, indent=4)
+    get_store().replace_all(profiles)
 
 
 def get_profile(username):
     """Find profile by username"""
-    profiles = load_profiles()
-    for profile in profiles:
-        if profile.get("username") == username:
-            return profile
-    return None
+    return get_store().get(username)
 
 
 def update_profile(new_profile):
     """Update or add profile to profiles.json"""
-    profiles = load_profiles()
-    for idx, profile in enumerate(profiles):
-        if profile.get("username") == new_profile.get("username"):
-            profiles[idx] = new_profile
-            save_profiles(profiles)
-            return
-    profiles.append(new_profile)
-    save_profiles(profiles)
+    get_store().update(new_profile)
 
 
-def get_categories():
-    """Fetch quiz categories from Open Trivia DB"""
+def record_session(username, correct, questions, difficulty, category=None):
+    """Add a finished quiz to the player's score history, if the store keeps one"""
+    store = get_store()
+    if store.keeps_history:
+        store.record_session(username, correct, questions, difficulty, category)
+
+
+def get_leaderboard(limit=10, difficulty=None):
+    """Profiles with the highest high scores"""
+    return get_store().leaderboard(limit, difficulty)
+
+
+def get_history(username, limit=10):
+    """The player's most recent quiz sessions, newest first, or None without a history"""
+    store = get_store()
+    return store.history(username, limit) if store.keeps_history else None
+
+
+def get_recent_accuracy(username, sessions=5):
+    """Share of questions answered correctly in the last few sessions, or None without a history"""
+    store = get_store()
+    return store.recent_accuracy(username, sessions) if store.keeps_history else None
+
+
+def fetch_categories(report=True):
+    """Fetch quiz categories from Open Trivia DB, or None if that fails"""
     try:
         response = requests.get(CATEGORY_URL, timeout=5)
         response.raise_for_status()
         data = response.json()
         categories = data.get("trivia_categories", [])
         return {cat["id"]: cat["name"] for cat in categories}
-    except requests.RequestException as e:
-        print(f"Error fetching categories: {e}")
-        return {}
+    except (requests.RequestException, ValueError) as e:
+        if report:
+            print(f"Error fetching categories: {e}")
+        return None
+
+
+def load_cached_categories():
+    """(fetched_at, categories) from the category cache, or (None, None)"""
+    try:
+        with open(CATEGORY_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        # json object keys are strings, category ids are ints
+        return cache["fetched_at"], {int(cid): name for cid, name in cache["categories"].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, None
+
+
+def refresh_categories(report=True):
+    """Fetch the categories and cache them, returns them or None"""
+    categories = fetch_categories(report)
+    if categories:
+        tmp = f"{CATEGORY_CACHE_FILE}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({"fetched_at": time.time(), "categories": categories}, f)
+            os.replace(tmp, CATEGORY_CACHE_FILE)
+        except OSError as e:
+            if report:
+                print(f"Error caching categories: {e}")
+    return categories
+
+
+def get_categories():
+    """Quiz categories, from the cache when there is one.
 
+    A cached list older than CATEGORY_TTL is still returned straight away and refreshed
+    in the background for next time. Without the network the last good list is used.
+    """
+    global _category_refresh
+    fetched_at, categories = load_cached_categories()
+    if categories is None:
+        return refresh_categories() or {}
+    if time.time() - fetched_at > CATEGORY_TTL and _category_refresh is None:
+        _category_refresh = threading.Thread(target=refresh_categories, args=(False,), daemon=True)
+        _category_refresh.start()
+    return categories